@@ -0,0 +1,157 @@
+# Run python3 benchmark.py [--sizes 10 100 ...] [--output results.json] [--baseline baseline.json] [--update-baseline]
+# Model layer benchmarks (Frontend & Firewall) on the fake ufw backend (GUFW_BACKEND=fake): no root
+# nor firewall needed. Synthetic profiles of every size; the median time and the processes spawned
+# (subprocess.Popen) by every operation are compared with the stored baseline: exit 1 on a regression
+import os, sys, json, time, argparse, platform, tempfile, statistics, subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'gufw'))
+os.environ['GUFW_BACKEND'] = 'fake'
+from gufw.model.frontend import Frontend
+from gufw.model.rule     import Rule
+
+SIZES     = [10, 100, 1000, 10000]
+BASELINE  = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TOLERANCE = 0.5   # Slower than the baseline by more than 50%...
+MIN_DELTA = 0.005 # ...and 5 ms: a regression
+
+
+def get_profile_rules(backend, size):
+    # Gufw rules as the fake backend lists them: a port from an address, IPv4 only
+    rules = []
+    for i in range(size):
+        from_ip = '10.%d.%d.%d' % (i >> 16, (i >> 8) & 255, i & 255)
+        to_port = str(1024 + i % 1000)
+        (tuples, error) = backend._get_tuples('allow', 'in', '', '', '', 'tcp', from_ip, '', '', to_port)
+        ufw_rule = backend.user_rules.get_rules(tuples[0][1])[0]
+        rules.append(Rule(ufw_rule    = ufw_rule,
+                          description = 'rule ' + str(i),
+                          command     = backend.get_rule_cmd('allow', 'in', '', '', '', 'tcp', from_ip, '', '', to_port),
+                          policy      = 'allow',
+                          direction   = 'in',
+                          protocol    = 'tcp',
+                          from_ip     = from_ip,
+                          to_port     = to_port))
+    return rules
+
+
+class SpawnCounter():
+    """Counts the processes spawned through subprocess.Popen while installed (with)"""
+    def __init__(self):
+        self.count = 0
+        self.popen = subprocess.Popen
+
+    def __enter__(self):
+        counter = self
+        class CountingPopen(self.popen):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+        subprocess.Popen = CountingPopen
+        return self
+
+    def __exit__(self, *args):
+        subprocess.Popen = self.popen
+
+
+def measure(results, name, function, repeat, prepare=None):
+    times = []
+    spawns = []
+    with SpawnCounter() as counter:
+        for i in range(repeat):
+            if prepare:
+                prepare()
+            count = counter.count
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+            spawns.append(counter.count - count)
+    results[name] = {'seconds': statistics.median(times), 'spawns': max(spawns)}
+
+
+def run(size):
+    frontend = Frontend() # New temporary directory
+    firewall = frontend.firewall
+    backend = firewall.backend
+    repeat = max(3, min(20, 2000 // size))
+    results = {}
+    try:
+        frontend.set_status(True)
+        empty = frontend.get_profile()
+        profile = 'Bench' + str(size)
+        backend.set_profile_values(profile, True, 'deny', 'allow', 'deny', get_profile_rules(backend, size))
+        firewall.get_all_profiles().append(profile)
+
+        measure(results, 'set_profile', lambda: frontend.set_profile(profile), repeat, lambda: frontend.set_profile(empty))
+        measure(results, 'get_rules', frontend.get_rules, repeat, backend.invalidate_snapshot)
+        backend.add_to_log('Benchmark ' + str(size)) # get_log reads an existing log
+        measure(results, 'get_log', frontend.get_log, repeat)
+        measure(results, 'get_net_interfaces', frontend.get_net_interfaces, repeat)
+        measure(results, 'add_rule', lambda: frontend.add_rule('', '', 'allow', 'in', '', '', '', 'udp', '', '', '', '9'), repeat,
+                lambda: frontend.get_number_rules() > size and frontend.delete_rule(size + 1))
+        measure(results, 'delete_rule', lambda: frontend.delete_rule(size + 1), repeat,
+                lambda: frontend.get_number_rules() == size and frontend.add_rule('', '', 'allow', 'in', '', '', '', 'udp', '', '', '', '9'))
+
+        with tempfile.TemporaryDirectory(prefix='gufw-bench-') as export_dir:
+            export_file = os.path.join(export_dir, 'Exported.profile')
+            frontend.export_profile(export_file)
+            names = ['Imported%d_%d' % (size, i) for i in range(repeat)]
+            measure(results, 'import_profile', lambda: frontend.import_profile(os.path.join(export_dir, names.pop(0) + '.profile')), repeat,
+                    lambda: os.link(export_file, os.path.join(export_dir, names[0] + '.profile')))
+
+        ufw_rules = backend.get_rules()
+        profile_rules = firewall._get_rules_profile()
+        ufw_before = firewall._compose_rules(ufw_rules, profile_rules)
+        ufw_after = ufw_before + [Rule('9/udp ALLOW IN Anywhere')]
+        measure(results, '_compose_rules', lambda: firewall._compose_rules(ufw_rules, profile_rules), repeat)
+        measure(results, '_regenerate_file_profile', lambda: firewall._regenerate_file_profile(ufw_before, profile_rules, ufw_after), repeat)
+    finally:
+        backend.cleanup()
+    return results
+
+
+def compare(results, baseline):
+    """Regressions: [(size, operation, baseline, now)], slower or spawning more processes"""
+    regressions = []
+    for (size, operations) in results['sizes'].items():
+        for (name, now) in operations.items():
+            before = baseline.get('sizes', {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if now['seconds'] > before['seconds'] * (1 + TOLERANCE) and now['seconds'] - before['seconds'] > MIN_DELTA:
+                regressions.append((size, name, '%.4f s' % before['seconds'], '%.4f s' % now['seconds']))
+            if 'spawns' in before and now['spawns'] > before['spawns']:
+                regressions.append((size, name, '%d spawns' % before['spawns'], '%d spawns' % now['spawns']))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Gufw model layer benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--output', help='JSON file for the results')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = {'python': platform.python_version(), 'machine': platform.machine(), 'sizes': {}}
+    print('%8s %-26s %12s %7s' % ('rules', 'operation', 'median', 'spawns'))
+    for size in args.sizes:
+        results['sizes'][str(size)] = run(size)
+        for (name, result) in results['sizes'][str(size)].items():
+            print('%8d %-26s %10.4f s %7d' % (size, name, result['seconds'], result['spawns']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        sys.exit(0)
+
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+        for (size, name, before, now) in regressions:
+            print('REGRESSION %s rules %s: %s > %s' % (size, name, before, now))
+        if regressions:
+            sys.exit(1)
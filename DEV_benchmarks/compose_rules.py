@@ -0,0 +1,91 @@
+# Run python3 compose_rules.py [number of rules]...
+# Microbenchmark of the ufw rules <> profile rules reconciliation (Firewall._compose_rules and
+# Firewall._regenerate_file_profile). The previous nested scans are timed too, up to LEGACY_MAX rules
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'gufw'))
+from gufw.model.firewall import Firewall
+from gufw.model.rule     import Rule
+
+LEGACY_MAX = 10000
+
+
+class NoBackend():
+    def set_profile_values(self, profile, status, incoming, outgoing, routed, rules):
+        pass
+
+
+def get_rules(total):
+    ufw_rules = []
+    profile_rules = []
+    for i in range(total):
+        ufw_rule = str(1024 + i) + '/tcp ALLOW IN Anywhere'
+        ufw_rules.append(Rule(ufw_rule))
+        if i % 10: # Some ufw rules are not in the profile
+            profile_rules.append(Rule(ufw_rule, command='/usr/sbin/ufw allow in proto tcp from any to any port ' + str(1024 + i)))
+    return (ufw_rules, profile_rules)
+
+
+def as_dicts(rules):
+    # Previous rule representation, for the legacy implementations
+    return [dict((field, getattr(rule, field)) for field in Rule.FIELDS) for rule in rules]
+
+
+def legacy_compose_rules(ufw_rules, profile_rules):
+    rules = []
+    for ufw_rule in ufw_rules:
+        rule = dict.fromkeys(Rule.FIELDS, '')
+        rule['ufw_rule'] = ufw_rule
+        for profile_rule in profile_rules:
+            if ufw_rule == profile_rule['ufw_rule']:
+                rule = dict(profile_rule)
+                break
+        rules.append(rule)
+    return rules
+
+
+def legacy_regenerate_file_profile(ufw_before, profile_before, ufw_after):
+    final_rules = []
+    for ufw_rule in ufw_after:
+        found = False
+        for profile_rule in profile_before:
+            if ufw_rule['ufw_rule'] == profile_rule['ufw_rule']:
+                found = True
+                new_rule = dict(profile_rule)
+        if not found:
+            if ufw_before.count(ufw_rule) == 0:
+                new_rule = dict(ufw_rule)
+            else:
+                continue
+        final_rules.append(new_rule)
+    return final_rules
+
+
+def timeit(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 10000]
+    
+    firewall = Firewall.__new__(Firewall)
+    firewall.backend = NoBackend()
+    firewall.profile = firewall.status = firewall.incoming = firewall.outgoing = firewall.routed = ''
+    
+    print('%8s %14s %14s %14s %14s' % ('rules', 'compose', 'legacy', 'regenerate', 'legacy'))
+    for size in sizes:
+        (ufw_rules, profile_rules) = get_rules(size)
+        ufw_before = firewall._compose_rules(ufw_rules, profile_rules)
+        ufw_after = firewall._compose_rules(ufw_rules + [Rule('1/tcp ALLOW IN Anywhere')], profile_rules)
+        
+        compose = timeit(firewall._compose_rules, ufw_rules, profile_rules)
+        regenerate = timeit(firewall._regenerate_file_profile, ufw_before, profile_rules, ufw_after)
+        legacy_compose = legacy_regenerate = '-'
+        if size <= LEGACY_MAX:
+            (legacy_profile, legacy_before, legacy_after) = (as_dicts(profile_rules), as_dicts(ufw_before), as_dicts(ufw_after))
+            legacy_compose = '%.4f s' % timeit(legacy_compose_rules, [rule.ufw_rule for rule in ufw_rules], legacy_profile)
+            legacy_regenerate = '%.4f s' % timeit(legacy_regenerate_file_profile, legacy_before, legacy_profile, legacy_after)
+        
+        print('%8d %12.4f s %14s %12.4f s %14s' % (size, compose, legacy_compose, regenerate, legacy_regenerate))
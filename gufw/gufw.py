@@ -16,6 +16,8 @@
 # along with Gufw; if not, see http://www.gnu.org/licenses for more
 # information.
 
+import sys, time
+
 from gufw.controller import Controller 
 from gufw.instance   import Instance
 from gufw.view.gufw  import Gufw
@@ -23,10 +25,16 @@ from gufw.view.gufw  import Gufw
 
 if __name__ == '__main__':
     
+    # When bin/gufw was launched (before pkexec) for the startup time
+    try:
+        launch_time = float(sys.argv[2])
+    except Exception:
+        launch_time = time.time()
+    
     app_instance = Instance()
     
     controler = Controller()
     
-    gufw = Gufw(controler.get_frontend())
+    gufw = Gufw(controler.get_frontend(), launch_time)
     
     app_instance.exit_app()
@@ -0,0 +1,336 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import os, re, shutil, ipaddress, subprocess
+
+NAME_RE = re.compile(r'^[A-Za-z0-9_]{1,20}$') # ipset names: 31 chars max
+BEGIN   = '# BEGIN GUFW ADDRESS LISTS'
+END     = '# END GUFW ADDRESS LISTS'
+ACTIONS = {'allow': 'ACCEPT', 'deny': 'DROP', 'reject': 'REJECT'}
+CHAINS  = {'in': ('ufw-before-input', 'src'), 'out': ('ufw-before-output', 'dst')}
+MAXELEM = 1048576 # Same for every set (swap & create -exist); the hash grows on demand
+
+
+class AddressLists():
+    """Named address lists of every profile (<path>/<profile>/<name>.list, one network by line) as
+       ipset hash:net sets, IPv4 & IPv6. A single hook line by list in before.rules & before6.rules
+       matches its set, so adding or removing addresses changes the set without a reload.
+       The sets are created again from <path>/active.ipset by before.init when ufw starts.
+       Without ipset, just the list files: the caller builds its own sets when apply() asks for a reload"""
+    def __init__(self, path, ufw_path='/etc/ufw', ipset=True):
+        self.path = path
+        self.ipset = ipset
+        self.before_rules = [(os.path.join(ufw_path, 'before.rules'), False), (os.path.join(ufw_path, 'before6.rules'), True)]
+        self.before_init = os.path.join(ufw_path, 'before.init')
+        self.restore_file = os.path.join(path, 'active.ipset')
+
+    def is_available(self):
+        return shutil.which('ipset') is not None
+
+    # LISTS
+    def get_lists(self, profile):
+        """[(name, policy, direction)]"""
+        lists = []
+        try:
+            files = sorted(os.listdir(os.path.join(self.path, profile)))
+        except Exception:
+            return lists
+        for file_name in files:
+            if file_name.endswith('.list'):
+                (policy, direction) = self._read_header(self._list_file(profile, file_name[:-len('.list')]))
+                lists.append((file_name[:-len('.list')], policy, direction))
+        return lists
+
+    def get_addresses(self, profile, name):
+        addresses = []
+        try:
+            with open(self._list_file(profile, name)) as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        addresses.append(line)
+        except Exception:
+            pass
+        return addresses
+
+    def add_list(self, profile, name, policy, direction):
+        """Returns (error message or '', hooks changed: the firewall needs a reload)"""
+        if not NAME_RE.match(name):
+            return ('Invalid name: ' + name, False)
+        if policy not in ACTIONS or direction not in CHAINS:
+            return ('Invalid policy or direction', False)
+        if os.path.exists(self._list_file(profile, name)):
+            return ('The list already exists: ' + name, False)
+        os.makedirs(os.path.join(self.path, profile), exist_ok=True)
+        self._write_list(profile, name, policy, direction, [])
+        return self.apply(profile)
+
+    def delete_list(self, profile, name):
+        """Returns (error message or '', hooks changed). destroy_sets() after the reload"""
+        try:
+            os.remove(self._list_file(profile, name))
+        except Exception:
+            pass
+        return self.apply(profile)
+
+    def destroy_sets(self, name):
+        # Just when the rules don't use them anymore
+        self._destroy(self._set_names(name))
+
+    def destroy_other_sets(self, profile):
+        """The sets of the previous profile lists, once a reload took their hooks out"""
+        if not self.ipset or not self.is_available():
+            return
+        try:
+            proc = subprocess.Popen(['ipset', 'list', '-n'], shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={'LANG':'C', 'PATH':'/usr/sbin:/sbin:/usr/bin:/bin'})
+            stdout, stderr = proc.communicate()
+        except Exception:
+            return
+        current = [set_name for (name, policy, direction) in self.get_lists(profile) for set_name in self._set_names(name)]
+        self._destroy([set_name for set_name in stdout.decode('utf-8', 'replace').split()
+                       if (set_name.startswith('gufw-') or set_name.startswith('gufw6-')) and set_name not in current])
+
+    def delete_profile(self, profile):
+        shutil.rmtree(os.path.join(self.path, profile), ignore_errors=True)
+
+    def rename_profile(self, old, new):
+        try:
+            os.rename(os.path.join(self.path, old), os.path.join(self.path, new))
+        except Exception:
+            pass
+
+    # ADDRESSES
+    def add_addresses(self, profile, name, addresses):
+        """Returns (error message or '', added, invalid addresses). The set changes, without reload"""
+        current = set(self.get_addresses(profile, name))
+        added = []
+        invalid = []
+        for address in addresses:
+            try:
+                network = str(ipaddress.ip_network(address.strip(), strict=False))
+            except ValueError:
+                invalid.append(address)
+                continue
+            if network not in current:
+                current.add(network)
+                added.append(network)
+        if added:
+            error = self._ipset(['add ' + self._set_name(name, network) + ' ' + network for network in added])
+            if error: # The list as the set
+                return (error, [], invalid)
+            with open(self._list_file(profile, name), 'a') as f:
+                f.write(''.join([network + '\n' for network in added]))
+            self._write_restore(profile)
+        return ('', added, invalid)
+
+    def import_file(self, profile, name, path, policy='deny', direction='in'):
+        """Merges a blocklist file (one IP, network or 'first-last' range by line, '#' or ';'
+           comments) into the list, creating it if needed. Overlapping and adjacent networks are
+           collapsed into the minimal covering set.
+           Returns (error message or '', hooks changed, (valid, invalid, stored networks))"""
+        if not os.path.exists(self._list_file(profile, name)):
+            if not NAME_RE.match(name):
+                return ('Invalid name: ' + name, False, (0, 0, 0))
+            if policy not in ACTIONS or direction not in CHAINS:
+                return ('Invalid policy or direction', False, (0, 0, 0))
+            os.makedirs(os.path.join(self.path, profile), exist_ok=True)
+        else:
+            (policy, direction) = self._read_header(self._list_file(profile, name))
+
+        networks = {4: [], 6: []}
+        valid = 0
+        invalid = 0
+        try:
+            with open(path, errors='replace') as f:
+                for line in f: # Streamed
+                    fields = line.split('#', 1)[0].split(';', 1)[0].split()
+                    if not fields:
+                        continue
+                    try:
+                        entry = list(self._parse_entry(fields[0]))
+                    except (ValueError, TypeError): # Not an address, mixed IPv4-IPv6 range...
+                        invalid += 1
+                        continue
+                    for network in entry:
+                        networks[network.version].append(network)
+                    valid += 1
+        except Exception as e:
+            return (str(e), False, (valid, invalid, 0))
+
+        for address in self.get_addresses(profile, name):
+            network = ipaddress.ip_network(address, strict=False)
+            networks[network.version].append(network)
+        stored = [str(network) for version in (4, 6) for network in ipaddress.collapse_addresses(networks[version])]
+        self._write_list(profile, name, policy, direction, stored)
+        (error, changed) = self.apply(profile)
+        return (error, changed, (valid, invalid, len(stored)))
+
+    def _parse_entry(self, entry):
+        if '-' in entry:
+            (first, last) = entry.split('-', 1)
+            return ipaddress.summarize_address_range(ipaddress.ip_address(first), ipaddress.ip_address(last))
+        return [ipaddress.ip_network(entry, strict=False)]
+
+    def delete_addresses(self, profile, name, addresses):
+        """Returns an error message or ''. The set changes, without reload"""
+        (policy, direction) = self._read_header(self._list_file(profile, name))
+        removed = set()
+        for address in addresses:
+            try:
+                removed.add(str(ipaddress.ip_network(address.strip(), strict=False)))
+            except ValueError:
+                continue
+        current = self.get_addresses(profile, name)
+        error = self._ipset(['del ' + self._set_name(name, network) + ' ' + network for network in current if network in removed])
+        if error: # The list as the set
+            return error
+        self._write_list(profile, name, policy, direction, [network for network in current if network not in removed])
+        self._write_restore(profile)
+        return ''
+
+    # KERNEL
+    def apply(self, profile):
+        """Fills the sets of the profile lists and writes their hooks.
+           Returns (error message or '', hooks changed: the firewall needs a reload)"""
+        if not self.ipset:
+            return ('', True)
+        lists = self.get_lists(profile)
+        if not self.is_available():
+            if lists:
+                return ('ipset not found', False)
+            return ('', False)
+        self._write_restore(profile)
+        # Filled aside and swapped: the sets are never empty while in use
+        commands = []
+        for (name, policy, direction) in lists:
+            for (set_name, family) in zip(self._set_names(name), ['inet', 'inet6']):
+                commands.append('create ' + set_name + ' hash:net family ' + family + ' maxelem ' + str(MAXELEM))
+                commands.append('create ' + set_name + '-t hash:net family ' + family + ' maxelem ' + str(MAXELEM))
+                commands.append('flush ' + set_name + '-t')
+            for network in self.get_addresses(profile, name):
+                commands.append('add ' + self._set_name(name, network) + '-t ' + network)
+            for set_name in self._set_names(name):
+                commands.append('swap ' + set_name + '-t ' + set_name)
+                commands.append('destroy ' + set_name + '-t')
+        error = self._ipset(commands)
+        if error:
+            return (error, False)
+        return ('', self._write_hooks(lists))
+
+    def get_hooks(self, lists, v6):
+        hooks = []
+        for (name, policy, direction) in lists:
+            (chain, match) = CHAINS[direction]
+            hooks.append('-A ' + chain + ' -m set --match-set ' + self._set_names(name)[int(v6)] + ' ' + match + ' -j ' + ACTIONS[policy])
+        return hooks
+
+    def _write_hooks(self, lists):
+        changed = False
+        for (path, v6) in self.before_rules:
+            changed |= self._write_block(path, '# End required lines', self.get_hooks(lists, v6))
+        if os.path.isfile(self.before_init): # ufw >= 0.36: the sets before the rules at boot
+            lines = []
+            if lists:
+                lines = ['    ipset restore -exist -file ' + self.restore_file + ' || true']
+            self._write_block(self.before_init, 'start)', lines)
+        return changed
+
+    def _write_block(self, path, after, lines):
+        """Replaces the marked block, placed after the first line starting with after. Returns if changed"""
+        try:
+            with open(path) as f:
+                previous = f.read()
+        except Exception:
+            return False
+        content = previous.split('\n')
+        if BEGIN in content:
+            begin = content.index(BEGIN)
+            end = begin
+            if END in content[begin:]:
+                end = content.index(END, begin)
+            del content[begin:end + 1]
+        if lines:
+            position = [i for (i, line) in enumerate(content) if line.strip().startswith(after)]
+            if not position:
+                return False
+            content[position[0] + 1:position[0] + 1] = [BEGIN] + lines + [END]
+        if '\n'.join(content) == previous:
+            return False
+        with open(path, 'w') as f:
+            f.write('\n'.join(content))
+        return True
+
+    def _write_restore(self, profile):
+        if not self.ipset:
+            return
+        lines = []
+        for (name, policy, direction) in self.get_lists(profile):
+            for (set_name, family) in zip(self._set_names(name), ['inet', 'inet6']):
+                lines.append('create ' + set_name + ' hash:net family ' + family + ' maxelem ' + str(MAXELEM))
+            lines.extend(['add ' + self._set_name(name, network) + ' ' + network for network in self.get_addresses(profile, name)])
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.restore_file, 'w') as f:
+            f.write(''.join([line + '\n' for line in lines]))
+
+    def _ipset(self, commands, ignore_errors=False):
+        # All the commands in one process
+        if not commands or not self.ipset:
+            return ''
+        try:
+            proc = subprocess.Popen(['ipset', 'restore', '-exist'], shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={'LANG':'C', 'PATH':'/usr/sbin:/sbin:/usr/bin:/bin'})
+            stdout, stderr = proc.communicate(''.join([command + '\n' for command in commands]).encode('utf-8'))
+        except Exception as e: # Not installed
+            return str(e)
+        if proc.returncode and not ignore_errors:
+            return stderr.decode('utf-8', 'replace').strip()
+        return ''
+
+    def _destroy(self, set_names):
+        # One by one: a set still in use (or not created) doesn't stop the others
+        for set_name in set_names:
+            self._ipset(['destroy ' + set_name], ignore_errors=True)
+
+    # FILES
+    def _list_file(self, profile, name):
+        return os.path.join(self.path, profile, name + '.list')
+
+    def _read_header(self, path):
+        # '# policy=deny direction=in'
+        values = {'policy': 'deny', 'direction': 'in'}
+        try:
+            with open(path) as f:
+                header = f.readline()
+        except Exception:
+            return (values['policy'], values['direction'])
+        for field in header.lstrip('#').split():
+            if '=' in field:
+                (key, value) = field.split('=', 1)
+                values[key] = value
+        return (values['policy'], values['direction'])
+
+    def _write_list(self, profile, name, policy, direction, addresses):
+        with open(self._list_file(profile, name), 'w') as f:
+            f.write('# policy=' + policy + ' direction=' + direction + '\n')
+            f.write(''.join([address + '\n' for address in addresses]))
+
+    def _set_names(self, name):
+        return ['gufw-' + name, 'gufw6-' + name]
+
+    def _set_name(self, name, network):
+        if ':' in network:
+            return 'gufw6-' + name
+        return 'gufw-' + name
@@ -0,0 +1,106 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+SHADOWED  = 'shadowed'  # An earlier rule takes all its traffic with another action
+REDUNDANT = 'redundant' # An earlier rule takes all its traffic with the same action
+CONFLICT  = 'conflict'  # An earlier rule takes part of its traffic with another action
+
+
+class RuleAnalyzer():
+    """Rules that can't match or fight with an earlier rule, from a compiled RuleMatcher.
+       A rule covering another one has to match its first packet, so just the matcher
+       candidates for that packet are compared, field by field (port ranges, networks)"""
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.rules = matcher.rules
+
+    def analyze(self):
+        """Returns {rule number: (SHADOWED | REDUNDANT | CONFLICT, earlier rule number)}"""
+        results = {}
+        unmatchable = set(self.matcher.unmatchable)
+        for (i, rule) in enumerate(self.rules):
+            if i in unmatchable:
+                continue
+            result = self._covered(i, rule)
+            if result is None:
+                result = self._conflict(i, rule)
+            if result is not None:
+                results[i + 1] = result
+        return results
+
+    def _covered(self, i, rule):
+        proto = rule.proto
+        if proto == 'any':
+            proto = None
+        for j in self.matcher.candidates(rule.flow, proto, self._first_address(rule.dst), self._first_port(rule.dport),
+                                         self._first_address(rule.src), self._first_port(rule.sport), rule.iface_in, rule.iface_out, rule.v6):
+            if j >= i:
+                return None
+            if self._covers(self.rules[j], rule):
+                if self.rules[j].action == rule.action:
+                    return (REDUNDANT, j + 1)
+                return (SHADOWED, j + 1)
+        return None
+
+    def _conflict(self, i, rule):
+        for j in self.matcher.overlapping(rule):
+            if j >= i:
+                return None
+            if self.rules[j].action != rule.action and not self._covers(rule, self.rules[j]):
+                return (CONFLICT, j + 1)
+        return None
+
+    def _covers(self, rule, other):
+        """All the traffic of other matches rule"""
+        if rule.proto != 'any' and rule.proto != other.proto:
+            return False
+        if not self._covers_ports(rule.dport, other.dport) or not self._covers_ports(rule.sport, other.sport):
+            return False
+        if not self._covers_network(rule.dst, other.dst) or not self._covers_network(rule.src, other.src):
+            return False
+        if rule.iface_in and rule.iface_in != other.iface_in:
+            return False
+        if rule.iface_out and rule.iface_out != other.iface_out:
+            return False
+        return True
+
+    def _covers_ports(self, ports, other_ports):
+        if ports is None:
+            return True
+        if other_ports is None:
+            return False
+        for (other_first, other_last) in other_ports:
+            if not [1 for (first, last) in ports if first <= other_first and other_last <= last]:
+                return False
+        return True
+
+    def _covers_network(self, network, other_network):
+        if network is None:
+            return True
+        if other_network is None:
+            return False
+        return other_network.subnet_of(network)
+
+    def _first_address(self, network):
+        if network is None:
+            return None
+        return network.network_address
+
+    def _first_port(self, ports):
+        if ports is None:
+            return None
+        return ports[0][0]
@@ -0,0 +1,207 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import os, configparser
+
+
+class FirewallBackend():
+    """What Firewall needs from a backend. Implementations: Backend (ufw), NftBackend (own nftables
+       table) and FakeUfwBackend (ufw emulated in a temporary directory, for tests & benchmarks).
+       Chosen by Firewall from GUFW_BACKEND in the environment or 'FirewallBackend' in gufw.cfg.
+       Rules are numbered as 'ufw status numbered' does (IPv4 first) and the profiles store ufw commands"""
+    GUFW_PATH = '/etc/gufw'
+    GUFW_CFG  = '/etc/gufw/gufw.cfg'
+    GUFW_LOG  = '/var/log/gufw.log'
+
+    # CFG FILE
+    def get_cfg_value(self, attribute):
+        cfg = configparser.ConfigParser()
+        try:
+            if not cfg.read([self.GUFW_CFG]):
+                return ''
+        except Exception:
+            os.remove(self.GUFW_CFG)
+            return ''
+
+        if not cfg.has_option('GufwConfiguration', attribute):
+            return ''
+
+        return cfg.get('GufwConfiguration', attribute)
+
+    def set_cfg_value(self, attr, value):
+        cfg_file = self.GUFW_CFG
+        if not os.path.isfile(cfg_file):
+            f = open(cfg_file, 'w')
+            cfg = configparser.ConfigParser()
+            cfg.add_section("GufwConfiguration")
+            cfg.write(f)
+            f.close()
+            os.chmod(cfg_file, 0o600) # Just an admin can read this file
+
+        cfg = configparser.ConfigParser()
+        cfg.read(cfg_file)
+        cfg.set('GufwConfiguration', attr, str(value))
+        f = open(cfg_file, 'w')
+        cfg.write(f)
+        f.close()
+
+    # FIREWALL
+    def get_snapshot(self):
+        """FirewallSnapshot: status, policies, logging & rules, shared until a change"""
+        raise NotImplementedError
+
+    def get_matcher(self):
+        """RuleMatcher of the snapshot rules"""
+        raise NotImplementedError
+
+    def invalidate_snapshot(self):
+        raise NotImplementedError
+
+    def get_status(self):
+        raise NotImplementedError
+
+    def set_status(self, status):
+        raise NotImplementedError
+
+    def get_policy(self, policy):
+        """policy: incoming | outgoing | routed. Returns allow | deny | reject (| disabled for routed)"""
+        raise NotImplementedError
+
+    def set_policy(self, policy, value):
+        raise NotImplementedError
+
+    def get_ufw_logging(self):
+        raise NotImplementedError
+
+    def set_ufw_logging(self, logging):
+        raise NotImplementedError
+
+    def reset_fw(self):
+        raise NotImplementedError
+
+    # RULES
+    def get_rules(self):
+        """[Rule] in order"""
+        raise NotImplementedError
+
+    def get_number_rules(self):
+        raise NotImplementedError
+
+    def add_rule(self, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        """Returns [ufw command, result]"""
+        raise NotImplementedError
+
+    def get_rule_cmd(self, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        """ufw command of a rule, as stored in the profiles"""
+        raise NotImplementedError
+
+    def set_rules(self, rules):
+        """The whole ruleset: a number keeps that current rule, a profile Rule is added. Returns [[cmd, result]]"""
+        raise NotImplementedError
+
+    def can_reorder(self):
+        """If set_rules() can change the order of the kept rules"""
+        raise NotImplementedError
+
+    def delete_rule(self, num):
+        """Returns [cmd, result]"""
+        raise NotImplementedError
+
+    def get_rule_counters(self):
+        """{rule number: (packets, bytes, packets/s)} or None if not available"""
+        raise NotImplementedError
+
+    # PROFILES & GUFW LOG
+    def set_profile_values(self, profile, status, incoming, outgoing, routed, rules):
+        raise NotImplementedError
+
+    def get_profile_values(self, profile):
+        """profile: name or absolute path. Returns (status, incoming, outgoing, routed, [Rule])"""
+        raise NotImplementedError
+
+    def get_profiles(self):
+        """Profile names, oldest first"""
+        raise NotImplementedError
+
+    def exists_profile(self, profile):
+        raise NotImplementedError
+
+    def delete_file_profile(self, profile):
+        raise NotImplementedError
+
+    def rename_file_profile(self, old, new):
+        raise NotImplementedError
+
+    def export_profile(self, profile, dst):
+        raise NotImplementedError
+
+    def refresh_log(self):
+        raise NotImplementedError
+
+    def add_to_log(self, msg):
+        raise NotImplementedError
+
+    def get_log(self):
+        raise NotImplementedError
+
+    # ADDRESS LISTS
+    def get_address_lists(self, profile):
+        raise NotImplementedError
+
+    def get_addresses(self, profile, name):
+        raise NotImplementedError
+
+    def add_address_list(self, profile, name, policy, direction):
+        raise NotImplementedError
+
+    def delete_address_list(self, profile, name):
+        raise NotImplementedError
+
+    def add_addresses(self, profile, name, addresses):
+        """Returns (error message or '', added networks, invalid addresses)"""
+        raise NotImplementedError
+
+    def delete_addresses(self, profile, name, addresses):
+        """Returns an error message or ''"""
+        raise NotImplementedError
+
+    def import_address_list(self, profile, name, list_file, policy, direction):
+        raise NotImplementedError
+
+    def apply_address_lists(self, profile):
+        raise NotImplementedError
+
+    # DIAGNOSTICS
+    def get_command_stats(self):
+        """[(command, calls, total, p50, p95, p99, stderr rate, {Firewall method: calls})] of the commands run"""
+        raise NotImplementedError
+
+    # LISTENING & NET
+    def get_listening_report(self):
+        raise NotImplementedError
+
+    def get_listening_monitor(self):
+        raise NotImplementedError
+
+    def wait_listening_change(self, timeout):
+        raise NotImplementedError
+
+    def get_net_interfaces(self):
+        raise NotImplementedError
+
+    def get_net_ip(self):
+        raise NotImplementedError
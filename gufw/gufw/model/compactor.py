@@ -0,0 +1,164 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+from gufw.model.rule import Rule
+
+MULTIPORT_MAX = 15 # iptables multiport: 15 ports, a range counts 2
+
+
+class RuleCompactor():
+    """Merges the port rules that differ just in the destination port into ufw multiport rules,
+       joining their descriptions. The merged rule takes the place of its first rule, so a rule can't join it if an earlier
+       rule in between (with another action) takes part of its traffic"""
+    def __init__(self, matcher, rules):
+        self.matcher = matcher # Compiled from the same rules
+        self.rules = rules
+
+    def compact(self):
+        """Returns the target for backend.set_rules(): a number keeps that rule, a Rule is a merged one"""
+        groups = []    # [[indexes]]
+        open_groups = {} # key > group
+        for (i, rule) in enumerate(self.rules):
+            key = self._key(rule)
+            if key is None:
+                groups.append([i])
+                continue
+            group = open_groups.get(key)
+            if group is not None and self._can_join(group, i):
+                group.append(i)
+                continue
+            group = [i]
+            open_groups[key] = group
+            groups.append(group)
+
+        target = []
+        for group in groups:
+            if len(group) == 1:
+                target.append(group[0] + 1)
+                continue
+            chunks = self._chunks(self._merge_ports([self.rules[i].dport for i in group]))
+            if len(chunks) >= len(group): # Nothing gained
+                target.extend([i + 1 for i in group])
+            else:
+                target.extend([self._merged_rule(self.rules[group[0]], ports, self._description(group, ports)) for ports in chunks])
+        return target
+
+    def count_iptables(self, rules):
+        """Estimated iptables rules for these ufw rules"""
+        total = 0
+        for rule in rules:
+            count = 1
+            if rule.proto == 'any' and (rule.dport is not None or rule.sport is not None):
+                count = 2 # One per protocol
+            if rule.action == 'limit':
+                count *= 3 # Recent set + recent update + accept
+            if rule.log:
+                count += 1
+            total += count
+        return total
+
+    def _key(self, rule):
+        # Just destination ports of one protocol, expressible as an ufw command
+        if rule.dapp or rule.sapp or rule.dport is None or rule.sport is not None:
+            return None
+        if rule.proto not in ['tcp', 'udp'] or ' # ' in rule.ufw_rule: # Without comments
+            return None
+        if rule.flow == 'fwd' and not (rule.iface_in and rule.iface_out):
+            return None
+        return (rule.action, rule.flow, rule.proto, rule.v6, rule.log, rule.src, rule.dst, rule.iface_in, rule.iface_out, bool(rule.command))
+
+    def _can_join(self, group, i):
+        for j in self.matcher.overlapping(self.rules[i]):
+            if j >= i:
+                return True
+            if j > group[0] and self.rules[j].action != self.rules[i].action:
+                return False
+        return True
+
+    def _merge_ports(self, port_lists):
+        ranges = sorted([ports for port_list in port_lists for ports in port_list])
+        merged = [list(ranges[0])]
+        for (first, last) in ranges[1:]:
+            if first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        return [(first, last) for (first, last) in merged]
+
+    def _chunks(self, ranges):
+        chunks = [[]]
+        size = 0
+        for (first, last) in ranges:
+            cost = 1
+            if first != last:
+                cost = 2
+            if size + cost > MULTIPORT_MAX:
+                chunks.append([])
+                size = 0
+            chunks[-1].append((first, last))
+            size += cost
+        return chunks
+
+    def _description(self, group, ports):
+        # The descriptions of the rules with ports in this merged rule, each one once
+        descriptions = []
+        for i in group:
+            rule = self.rules[i]
+            if not rule.description or rule.description in descriptions:
+                continue
+            if [1 for (first, last) in rule.dport for (chunk_first, chunk_last) in ports if first <= chunk_last and chunk_first <= last]:
+                descriptions.append(rule.description)
+        return ', '.join(descriptions)
+
+    def _merged_rule(self, rule, ports, description):
+        to_port = ','.join([self._port(first, last) for (first, last) in ports])
+        direction = rule.flow
+        iface = rule.iface_in
+        routed = ''
+        if rule.flow == 'fwd':
+            (direction, routed) = ('in', rule.iface_out)
+        elif rule.flow == 'out':
+            iface = rule.iface_out
+
+        merged = Rule(ufw_rule    = rule.ufw_rule, # Until applied: just the IP family
+                      description = description,
+                      command     = rule.command,  # Until applied: just if it's a Gufw rule
+                      policy      = rule.action,
+                      direction   = direction,
+                      protocol    = rule.proto,
+                      from_ip     = self._address(rule.src),
+                      to_ip       = self._address(rule.dst),
+                      to_port     = to_port,
+                      iface       = iface,
+                      routed      = routed,
+                      logging     = rule.log)
+        for field in Rule.PARSED:
+            setattr(merged, field, getattr(rule, field))
+        merged.dport = list(ports)
+        return merged
+
+    def _port(self, first, last):
+        if first == last:
+            return str(first)
+        return str(first) + ':' + str(last)
+
+    def _address(self, network):
+        if network is None:
+            return ''
+        if network.prefixlen == network.max_prefixlen:
+            return str(network.network_address)
+        return str(network)
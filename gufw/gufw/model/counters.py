@@ -0,0 +1,91 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import time, shutil, subprocess
+from gufw.model.user_rules import UserRules
+
+
+class CounterCollector():
+    """Packets and bytes of every ufw rule from one 'iptables-save -c' & 'ip6tables-save -c' dump.
+       The entries of the ufw-user-* chains are mapped to the rule numbers through the tuples of
+       user.rules & user6.rules (parsed again just when they change). The rate is the delta
+       since the previous sample"""
+    SAVE = [(False, 'iptables-save'), (True, 'ip6tables-save')]
+
+    def __init__(self):
+        self.rules_files = None # user.rules & user6.rules of the chains
+        self.chains = {}        # (v6, chain) > [rule number | 0]
+        self.last = {}          # rule number > (packets, bytes)
+        self.last_time = 0
+
+    def is_available(self):
+        return shutil.which('iptables-save') is not None
+
+    def sample(self, user_rules, user6_rules=''):
+        """{rule number: (packets, bytes, packets per second since the previous sample)}"""
+        if (user_rules, user6_rules) != self.rules_files: # Other rules: other numbers
+            self.chains = UserRules().get_chain_rules(user_rules, user6_rules)
+            self.rules_files = (user_rules, user6_rules)
+            self.last = {}
+
+        totals = {}
+        for (v6, cmd) in self.SAVE:
+            if [chain for chain in self.chains if chain[0] == v6]:
+                self._read_dump(self._save(cmd), v6, totals)
+
+        now = time.monotonic()
+        elapsed = now - self.last_time
+        counters = {}
+        for (number, (packets, size)) in totals.items():
+            rate = 0.0
+            if number in self.last and elapsed > 0:
+                delta = packets - self.last[number][0]
+                if delta < 0: # Reset by a reload
+                    delta = packets
+                rate = delta / elapsed
+            counters[number] = (packets, size, rate)
+        self.last = totals
+        self.last_time = now
+        return counters
+
+    def _save(self, cmd):
+        try:
+            proc = subprocess.Popen([cmd, '-c'], shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={'LANG':'C', 'PATH':'/usr/sbin:/sbin:/usr/bin:/bin'})
+            stdout, stderr = proc.communicate()
+            return stdout.decode('utf-8', 'replace')
+        except Exception: # Not installed
+            return ''
+
+    def _read_dump(self, dump, v6, totals):
+        # [packets:bytes] -A chain ... in the same order than the rules file
+        positions = {}
+        for line in dump.split('\n'):
+            if not line.startswith('['):
+                continue
+            fields = line.split(' ', 3)
+            if len(fields) < 3 or fields[1] != '-A':
+                continue
+            numbers = self.chains.get((v6, fields[2]))
+            if numbers is None:
+                continue
+            position = positions.get(fields[2], 0)
+            positions[fields[2]] = position + 1
+            if position >= len(numbers) or not numbers[position]:
+                continue
+            (packets, size) = fields[0][1:-1].split(':')
+            (total_packets, total_size) = totals.get(numbers[position], (0, 0))
+            totals[numbers[position]] = (total_packets + int(packets), total_size + int(size))
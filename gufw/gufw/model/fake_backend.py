@@ -0,0 +1,91 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import os, shutil, tempfile
+from gufw.model.nft_backend import NftBackend, POLICIES
+from gufw.model.snapshot    import FirewallSnapshot
+from gufw.model.rule        import RULE_RE
+
+
+class FakeUfwBackend(NftBackend):
+    """ufw emulated without root nor a firewall, for tests & benchmarks: the ufw tuples, numbering and
+       insert semantics of NftBackend, nothing loaded into the kernel. The rules are read back from an
+       emulated 'ufw status numbered' output. Config, profiles, log & rules in a temporary directory"""
+    def __init__(self, path=''):
+        self.temporary = not path
+        self.path = path or tempfile.mkdtemp(prefix='gufw-')
+        self.GUFW_PATH = self.path
+        self.GUFW_CFG  = os.path.join(self.path, 'gufw.cfg')
+        self.GUFW_LOG  = os.path.join(self.path, 'gufw.log')
+        NftBackend.__init__(self)
+
+    def is_available(self):
+        return True
+
+    def cleanup(self):
+        if self.temporary:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def _apply(self):
+        return '' # No kernel
+
+    def get_snapshot(self):
+        snapshot = self.snapshot
+        if snapshot is None:
+            rules = self.user_rules.get_rules('\n'.join(self.tuples[False]), '\n'.join(self.tuples[True]))
+            default = '\n'.join(['DEFAULT_INPUT_POLICY="'   + POLICIES[self.state['incoming']] + '"',
+                                 'DEFAULT_OUTPUT_POLICY="'  + POLICIES[self.state['outgoing']] + '"',
+                                 'DEFAULT_FORWARD_POLICY="' + POLICIES[self.state['routed']] + '"'])
+            conf = 'LOGLEVEL=' + self.state['logging']
+            sysctl = 'net/ipv4/ip_forward=1'
+            if self.state['status'] == 'enabled':
+                snapshot = FirewallSnapshot(self.get_status_numbered(rules), default, conf, sysctl)
+            else: # ufw lists nothing: from the rules files
+                snapshot = FirewallSnapshot('Status: inactive', default, conf, sysctl, rules)
+            self.snapshot = snapshot
+        return snapshot
+
+    def get_status_numbered(self, rules):
+        """'ufw status numbered' output"""
+        lines = ['Status: active', '',
+                 '     To                         Action      From',
+                 '     --                         ------      ----']
+        width = len(str(len(rules)))
+        for (num, ufw_rule) in enumerate(rules, 1):
+            match = RULE_RE.match(ufw_rule.split(' # ')[0])
+            if not match:
+                continue
+            (dst, action, flow, src) = match.groups()
+            comment = ''
+            if ' # ' in ufw_rule:
+                comment = ' # ' + ufw_rule.split(' # ', 1)[1]
+            lines.append('[' + str(num).rjust(width) + '] ' + dst.ljust(26) + ' ' + (action + ' ' + flow).ljust(11) + ' ' + src + comment)
+        return '\n'.join(lines) + '\n'
+
+    def get_listening_report(self):
+        if self.sockets:
+            return self.sockets.collect(self.get_matcher())
+        return [] # No 'ufw show listening'
+
+    # Logged as ufw would
+    def set_rules(self, rules):
+        result = NftBackend.set_rules(self, rules)
+        return [[self.UFW_PATH + ' reload', cmd[1].replace('Rules updated', 'Firewall reloaded')] for cmd in result]
+
+    def delete_rule(self, num):
+        result = NftBackend.delete_rule(self, num)
+        return [' '.join([self.UFW_PATH, '--force', 'delete', str(num)]), result[1]]
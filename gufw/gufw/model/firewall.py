@@ -15,8 +15,15 @@
 # along with Gufw; if not, see http://www.gnu.org/licenses for more
 # information.
 
-import glob, os
+import os, socket, difflib, concurrent.futures
+from gufw.model.backend     import FirewallBackend
 from gufw.model.ufw_backend import Backend
+from gufw.model.nft_backend import NftBackend
+from gufw.model.fake_backend import FakeUfwBackend
+from gufw.model.rule        import Rule
+from gufw.model.analyzer    import RuleAnalyzer, REDUNDANT
+from gufw.model.compactor   import RuleCompactor
+from gufw.model.reorder     import RuleReorderer
 
 import gettext
 from gettext import gettext as _
@@ -26,7 +33,19 @@ gettext.textdomain('gufw')
 class Firewall():
     """Set or get the Firewall properties"""
     def __init__(self):
-        self.backend = Backend()
+        self.backend = self._new_backend()
+        
+        # ufw status runs while the Gufw config and profiles are checked
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            snapshot = executor.submit(self.backend.get_snapshot)
+            
+            self.gufw_logging = True # By default
+            if self.get_cfg_value('GufwLogging') == 'no':
+                self.gufw_logging = False
+            
+            self.profile = ''
+            self._user_changed_language() # Rename profile files
+            snapshot.result()
         
         self.status = self.backend.get_status()
         self.incoming = self.backend.get_policy('incoming')
@@ -34,13 +53,8 @@ class Firewall():
         self.routed   = self.backend.get_policy('routed')
         self.ufw_logging = self.backend.get_ufw_logging()
         
-        self.gufw_logging = True # By default
-        if self.get_cfg_value('GufwLogging') == 'no':
-            self.gufw_logging = False
-        
-        self.profile = ''
-        self._user_changed_language() # Rename profile files
-        self.all_profiles = self._read_all_profiles()
+        self.all_profiles = None # Read on demand (hidden by default)
+        self.analysis = None     # (RuleMatcher, results)
         self.profile = self._read_default_profile()
         
     # PROFILES
@@ -49,18 +63,14 @@ class Firewall():
     
     def set_profile(self, profile):
         operation = []
-        # Force show current rules
-        if not self.status:
-            self.backend.set_status(True)
-        # Remove Gufw rules previous profile
+        # Keep the ufw rules, replace the Gufw rules of the previous profile
         old_rules = self.get_rules(False)
-        ind = len(old_rules)
-        for old_row in reversed(old_rules):
-            if old_row['command']: # It's a gufw rule
-                result = self.backend.delete_rule(str(ind))
-                line = _("Deleting previous rules: ") + str(ind) + ' ' + result[0] + ' > ' + result[1].replace('\n', ' | ')
-                operation.append(line)
-            ind -= 1
+        target_rules = []
+        ind = 1
+        for old_row in old_rules:
+            if not old_row.command: # It's an ufw rule
+                target_rules.append((old_row.ufw_rule, ind, old_row.v6))
+            ind += 1
         
         # Set new profile in cfg file
         self.profile = profile
@@ -71,21 +81,21 @@ class Firewall():
         
         # Adding Gufw rules in new profile
         for new_row in new_rules:
-            if new_row['command']: # It's a gufw rule
-                result = self.backend.add_rule('', # Insert in order
-                                                new_row['policy'],
-                                                new_row['direction'],
-                                                new_row['iface'],
-                                                new_row['routed'],
-                                                new_row['logging'],
-                                                new_row['protocol'],
-                                                new_row['from_ip'],
-                                                new_row['from_port'],
-                                                new_row['to_ip'],
-                                                new_row['to_port'])
-                line = _("Appending new rules: ") + result[0] + ' > ' + result[1].replace('\n', ' | ')
+            if new_row.command: # It's a gufw rule
+                target_rules.append((new_row.ufw_rule, new_row, new_row.v6))
+        
+        # Just the differences, all at once: one write of the ufw rules and one reload
+        target_rules = self._diff_rules(old_rules, target_rules)
+        if target_rules != list(range(1, len(old_rules) + 1)):
+            for result in self.backend.set_rules(target_rules):
+                line = _("Applying rules: ") + result[0] + ' > ' + result[1].replace('\n', ' | ')
                 operation.append(line)
         
+        # Sets & hooks of the new profile address lists
+        error = self.backend.apply_address_lists(profile)
+        if error:
+            operation.append(_("Address lists: ") + error)
+        
         # New status, incoming, outgoing, routed
         self.status   = new_status
         self.incoming = new_incoming
@@ -98,21 +108,24 @@ class Firewall():
         return operation
     
     def get_all_profiles(self):
+        if self.all_profiles is None:
+            self.all_profiles = self._read_all_profiles()
         return self.all_profiles
     
     def add_profile(self, profile):
-        self.all_profiles.append(profile)
+        self.get_all_profiles().append(profile)
         self.backend.set_profile_values(profile, self.status, self.incoming, self.outgoing, self.routed, []) # Will create profile
     
     def delete_profile(self, profile):
-        self.all_profiles.remove(profile)
+        self.get_all_profiles().remove(profile)
         self.backend.delete_file_profile(profile)
     
     def rename_profile(self, old, new):
         if old == self.profile:
             return
         self.backend.rename_file_profile(old, new)
-        self.all_profiles[self.all_profiles.index(old)] = new
+        all_profiles = self.get_all_profiles()
+        all_profiles[all_profiles.index(old)] = new
     
     def import_profile(self, profile_file):
         new_profile = os.path.basename(profile_file)
@@ -123,6 +136,11 @@ class Firewall():
         
     def export_profile(self, profile_file):
         self.backend.export_profile(self.profile, profile_file)
+    
+    def import_address_list(self, list_file, name, policy='deny', direction='in'):
+        """Blocklist file into an address list of the current profile, matched by a single rule.
+           Returns (error message or '', (valid entries, invalid entries, stored networks))"""
+        return self.backend.import_address_list(self.profile, name, list_file, policy, direction)
         
     
     # BASIC
@@ -164,20 +182,56 @@ class Firewall():
     
     # RULES
     def get_rules(self, force_fw_on):
-        if self.backend.get_status():
-            ufw_rules = self.backend.get_rules()
-        else:
-            if force_fw_on:
-                self.backend.set_status(True)
-            ufw_rules = self.backend.get_rules()
-            if force_fw_on:
-                self.backend.set_status(False)
+        # force_fw_on is not needed anymore: a disabled firewall's rules are read from the ufw files
+        ufw_rules = self.backend.get_rules()
         profile_rules = self._get_rules_profile()
         return self._compose_rules(ufw_rules, profile_rules)
     
     def get_number_rules(self):
         return self.backend.get_number_rules()
     
+    def simulate(self, direction, iface, proto, src, sport, dst, dport, ignore=(), routed=''):
+        """What happens to a packet: (first matching rule or None, verdict)
+           direction: in | out | routed. Empty fields (any value) just match the rules not restricting them
+           Ports as in a rule ('22/tcp', '80:90', '80,443', 'ssh'): its first port, the protocol from the suffix
+           ignore: rule numbers to leave out. routed: the out interface of a routed packet (iface is the in one)"""
+        flow = {'in': 'in', 'out': 'out', 'routed': 'fwd'}[direction]
+        v6 = bool([1 for address in [src, dst] if address and ':' in address])
+        (iface_in, iface_out) = (iface, '')
+        if direction == 'out':
+            (iface_in, iface_out) = ('', iface)
+        elif direction == 'routed':
+            iface_out = routed
+        proto = proto or self._port_proto(dport) or self._port_proto(sport)
+        
+        matcher = self.backend.get_matcher()
+        for i in matcher.candidates(flow, proto or None, dst or None, self._port(dport, proto), src or None, self._port(sport, proto), iface_in, iface_out, v6):
+            if i + 1 not in ignore:
+                return (matcher.rules[i], matcher.rules[i].action)
+        
+        return (None, self.get_policy({'in': 'incoming', 'out': 'outgoing', 'routed': 'routed'}[direction]))
+    
+    def _port(self, port, proto):
+        # A port of the packet: the first one of a range or list, a service name from /etc/services.
+        # Unknown service: any port (just the rules without ports match)
+        if port == '' or port is None:
+            return None
+        port = str(port).split('/')[0].split(',')[0].split(':')[0]
+        if port.isdigit():
+            return int(port)
+        try:
+            if proto in ['tcp', 'udp']:
+                return socket.getservbyname(port, proto)
+            return socket.getservbyname(port)
+        except OSError:
+            return None
+    
+    def _port_proto(self, port):
+        # '22/tcp' > 'tcp'
+        if port and '/' in str(port):
+            return str(port).split('/', 1)[1]
+        return ''
+    
     def add_rule(self, description, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
         rules_before = self.get_rules(True)
         rules_profile_before = self._get_rules_profile()
@@ -192,6 +246,65 @@ class Firewall():
             cmd.insert(0, False)
         return cmd # For logging
     
+    def analyze_rules(self):
+        """{rule number: (shadowed | redundant | conflict, earlier rule number)}"""
+        matcher = self.backend.get_matcher() # Same rules and numbers than get_rules()
+        if self.analysis is None or self.analysis[0] is not matcher:
+            self.analysis = (matcher, RuleAnalyzer(matcher).analyze())
+        return self.analysis[1]
+    
+    def remove_redundant_rules(self):
+        """Removes the rules that can't match and have the same action than the rule taking their traffic"""
+        redundant = set([num for (num, (kind, other)) in self.analyze_rules().items() if kind == REDUNDANT])
+        if not redundant:
+            return []
+        rules_before = self.get_rules(True)
+        rules_profile_before = self._get_rules_profile()
+        result = self.backend.set_rules([num for num in range(1, len(rules_before) + 1) if num not in redundant])
+        rules_after = self.get_rules(True)
+        self._regenerate_file_profile(rules_before, rules_profile_before, rules_after)
+        return result # For logging
+    
+    def get_compacted_rules(self):
+        """Preview of compact_rules(): (target for backend.set_rules(), iptables rules now, iptables rules after)"""
+        rules = self.get_rules(True)
+        compactor = RuleCompactor(self.backend.get_matcher(), rules)
+        target = compactor.compact()
+        after = [rules[rule - 1] if isinstance(rule, int) else rule for rule in target]
+        return (target, compactor.count_iptables(rules), compactor.count_iptables(after))
+    
+    def compact_rules(self):
+        """Merges the single port rules into multiport rules, all the ruleset in one go"""
+        (target, before, after) = self.get_compacted_rules()
+        merged = [rule for rule in target if not isinstance(rule, int)]
+        if not merged:
+            return []
+        rules_before = self.get_rules(True)
+        rules_profile_before = self._get_rules_profile()
+        result = self.backend.set_rules(target)
+        rules_after = self.get_rules(True)
+        
+        # Kept rules from the previous profile, the merged ones (same order) completed with their command
+        profile_index = self._index_rules(rules_profile_before)
+        ufw_before_index = self._index_rules(rules_before)
+        new_rules = [rule for rule in rules_after if rule.ufw_rule not in ufw_before_index]
+        if len(new_rules) != len(merged): # Unexpected ufw output
+            self._regenerate_file_profile(rules_before, rules_profile_before, rules_after)
+            return result
+        
+        final_rules = []
+        for rule in rules_after:
+            if rule.ufw_rule in profile_index:
+                final_rules.append(profile_index[rule.ufw_rule][0])
+            elif rule.ufw_rule not in ufw_before_index:
+                new_rule = merged.pop(0)
+                if new_rule.command: # It's a Gufw rule
+                    new_rule.ufw_rule = rule.ufw_rule
+                    new_rule.command = self.backend.get_rule_cmd(new_rule.policy, new_rule.direction, new_rule.iface, new_rule.routed, new_rule.logging, new_rule.protocol, new_rule.from_ip, new_rule.from_port, new_rule.to_ip, new_rule.to_port)
+                    final_rules.append(new_rule)
+        self.backend.set_profile_values(self.profile, self.status, self.incoming, self.outgoing, self.routed, final_rules)
+        return result # For logging
+    
     def delete_rule(self, num):
         rules_before = self.get_rules(True)
         rules_profile_before = self._get_rules_profile()
@@ -232,10 +345,70 @@ class Firewall():
         self.backend.refresh_log()
     
     
+    # ADDRESS LISTS > For current profile
+    def get_address_lists(self):
+        """[(name, policy, direction)]"""
+        return self.backend.get_address_lists(self.profile)
+    
+    def get_addresses(self, name):
+        return self.backend.get_addresses(self.profile, name)
+    
+    def add_address_list(self, name, policy, direction):
+        """Returns an error message or ''"""
+        return self.backend.add_address_list(self.profile, name, policy, direction)
+    
+    def delete_address_list(self, name):
+        return self.backend.delete_address_list(self.profile, name)
+    
+    def add_addresses(self, name, addresses):
+        """Returns (error message or '', added networks, invalid addresses)"""
+        return self.backend.add_addresses(self.profile, name, addresses)
+    
+    def delete_addresses(self, name, addresses):
+        """Returns an error message or ''"""
+        return self.backend.delete_addresses(self.profile, name, addresses)
+    
+    
+    # COUNTERS
+    def get_rule_counters(self):
+        """{rule number: (packets, bytes, packets/s)} or None if disabled"""
+        return self.backend.get_rule_counters()
+    
+    
+    def get_reorder_suggestion(self, counters):
+        """From a get_rule_counters() sample: (rule numbers in the new order, saved comparisons per second,
+           moved rules) or None if ufw can't reorder its rules in one go"""
+        if not self.backend.can_reorder():
+            return None
+        return RuleReorderer(self.backend.get_matcher(), counters).suggest()
+    
+    def reorder_rules(self, order):
+        """order: every current rule number, in the new order"""
+        rules_before = self.get_rules(True)
+        if sorted(order) != list(range(1, len(rules_before) + 1)): # Outdated
+            return []
+        rules_profile_before = self._get_rules_profile()
+        result = self.backend.set_rules(order)
+        rules_after = self.get_rules(True)
+        self._regenerate_file_profile(rules_before, rules_profile_before, rules_after)
+        return result # For logging
+    
+    
+    # DIAGNOSTICS
+    def get_command_stats(self):
+        return self.backend.get_command_stats()
+    
+    
     # LISTENING
     def get_listening_report(self):
         return self.backend.get_listening_report()
     
+    def get_listening_monitor(self):
+        return self.backend.get_listening_monitor()
+    
+    def wait_listening_change(self, timeout):
+        return self.backend.wait_listening_change(timeout)
+    
     
     # CFG FILES
     def get_cfg_value(self, attrib):
@@ -261,7 +434,24 @@ class Firewall():
         return all_faces
     
     # STUFF
+    def _new_backend(self):
+        # GUFW_BACKEND in the environment or 'FirewallBackend' in gufw.cfg: ufw (default) | nftables | fake
+        name = os.environ.get('GUFW_BACKEND') or FirewallBackend().get_cfg_value('FirewallBackend')
+        if name == 'fake':
+            return FakeUfwBackend()
+        if name == 'nftables':
+            backend = NftBackend()
+            if backend.is_available():
+                return backend
+        return Backend()
+    
     def _read_default_profile(self):
+        default_profile = self.get_cfg_value('Profile')
+        # Usual: It exists, without reading all the profiles
+        if default_profile and self.backend.exists_profile(default_profile):
+            return default_profile
+        
+        self.get_all_profiles() # First run creates them
         default_profile = self.get_cfg_value('Profile')
         # Just be sure
         if not default_profile:
@@ -276,11 +466,8 @@ class Firewall():
     def _read_all_profiles(self):
         profiles = []
         while not profiles:
-            files = glob.glob('/etc/gufw/*.profile')
-            files.sort(key=lambda x: os.path.getctime(x)) # Sort by time and date
-            
-            for profile in files:
-                profiles.append(os.path.splitext(os.path.basename(profile))[0].replace(' ', '_')) # Filename without path and extension
+            for profile in self.backend.get_profiles():
+                profiles.append(profile.replace(' ', '_'))
             
             if not profiles: # First run
                 self.backend.set_profile_values(_("Public").replace(' ', '_'), True, 'reject',  'allow', 'allow', [])
@@ -291,90 +478,55 @@ class Firewall():
         return profiles
     
     def _user_changed_language(self):
-        # Rename profiles file
-        profiles = []
+        # Rename profiles file (just the default ones, without reading all the profiles)
         default_profile = self.get_cfg_value('Profile')
-        files = glob.glob('/etc/gufw/*.profile')
-        files.sort(key=lambda x: os.path.getctime(x)) # Sort by time and date
+        for (profile, translated) in [('Home', _("Home")), ('Office', _("Office")), ('Public', _("Public"))]:
+            if translated == profile or not self.backend.exists_profile(profile):
+                continue
+            self.backend.rename_file_profile(profile, translated)
+            self.add_to_log(_("Renamed profile: ") + profile + " > " + translated)
+            if default_profile == profile:
+                self.set_cfg_value('Profile', translated)
+    
+    def _diff_rules(self, old_rules, target_rules):
+        """target_rules: (ufw rule, current number or profile rule, IPv6). Returns the target for
+           backend.set_rules() keeping every current rule that is already in place"""
+        # ufw lists all the IPv4 rules before the IPv6 ones
+        target_rules = sorted(target_rules, key=lambda rule: rule[2])
         
-        for profile in files:
-            profiles.append(_(os.path.splitext(os.path.basename(profile))[0]).replace(' ', '_')) # Filename without path and extension
+        old_keys = [rule.ufw_rule for rule in old_rules]
+        target_keys = [rule[0] for rule in target_rules]
+        target = [rule[1] for rule in target_rules]
         
-        for profile in profiles:
-            if profile == _("Home") and profile != 'Home':
-                self.backend.rename_file_profile('Home', _("Home"))
-                self.add_to_log(_("Renamed profile: ") + 'Home' + " > " + _("Home"))
-                if default_profile == 'Home':
-                    self.set_cfg_value('Profile', _("Home"))
-            if profile == _("Office") and profile != 'Office':
-                self.backend.rename_file_profile('Office', _("Office"))
-                self.add_to_log(_("Renamed profile: ") + 'Office' + " > " + _("Office"))
-                if default_profile == 'Office':
-                    self.set_cfg_value('Profile', _("Office"))
-            if profile == _("Public") and profile != 'Public':
-                self.backend.rename_file_profile('Public', _("Public"))
-                self.add_to_log(_("Renamed profile: ") + 'Public' + " > " + _("Public"))
-                if default_profile == 'Public':
-                    self.set_cfg_value('Profile', _("Public"))
+        matcher = difflib.SequenceMatcher(None, old_keys, target_keys, autojunk=False)
+        for (tag, i1, i2, j1, j2) in matcher.get_opcodes():
+            if tag == 'equal':
+                for offset in range(i2 - i1):
+                    target[j1 + offset] = i1 + offset + 1
+        
+        return target
+    
+    def _index_rules(self, rules):
+        """ufw rule > [rules] (a profile could have the same ufw rule more than once)"""
+        index = {}
+        for rule in rules:
+            index.setdefault(rule.ufw_rule, []).append(rule)
+        return index
     
     def _compose_rules(self, ufw_rules, profile_rules):
         rules = []
+        profile_index = self._index_rules(profile_rules)
         for ufw_rule in ufw_rules:
-            rule = {'ufw_rule'   : ufw_rule, # ufw rule
-                    'description': '', # description
-                    'command'    : '', # command
-                    'policy'     : '', # policy
-                    'direction'  : '', # direction
-                    'protocol'   : '', # proto
-                    'from_ip'    : '', # from_ip
-                    'from_port'  : '', # from_port
-                    'to_ip'      : '', # to_ip
-                    'to_port'    : '', # to_port
-                    'iface'      : '', # iface
-                    'routed'     : '', # routed
-                    'logging'    : ''} # logging
-            
-            for profile_rule in profile_rules:
-                if ufw_rule == profile_rule['ufw_rule']:
-                    rule = {'ufw_rule'    : profile_rule['ufw_rule'],    # ufw rule
-                            'description' : profile_rule['description'], # description
-                            'command'     : profile_rule['command'],     # command
-                            'policy'      : profile_rule['policy'],      # policy
-                            'direction'   : profile_rule['direction'],   # direction
-                            'protocol'    : profile_rule['protocol'],    # proto
-                            'from_ip'     : profile_rule['from_ip'],     # from_ip
-                            'from_port'   : profile_rule['from_port'],   # from_port
-                            'to_ip'       : profile_rule['to_ip'],       # to_ip
-                            'to_port'     : profile_rule['to_port'],     # to_port
-                            'iface'       : profile_rule['iface'],       # iface
-                            'routed'      : profile_rule['routed'],      # routed
-                            'logging'     : profile_rule['logging']}     # logging
-                    break
-            
-            rules.append(rule)
+            if ufw_rule.ufw_rule in profile_index:
+                rules.append(profile_index[ufw_rule.ufw_rule][0]) # Duplicated: The first one
+            else:
+                rules.append(ufw_rule) # Not from Gufw: Without profile fields
             
         return rules
     
     def _get_rules_profile(self):
-        rules_profile = []
         (status, incoming, outgoing, routed, rules) = self.backend.get_profile_values(self.profile)
-        for rule in rules:
-            conver_rules = {'ufw_rule'    : rule['ufw_rule'],
-                            'description' : rule['description'],
-                            'command'     : rule['command'],
-                            'policy'      : rule['policy'],
-                            'direction'   : rule['direction'],
-                            'protocol'    : rule['protocol'],
-                            'from_ip'     : rule['from_ip'],
-                            'from_port'   : rule['from_port'],
-                            'to_ip'       : rule['to_ip'],
-                            'to_port'     : rule['to_port'],
-                            'iface'       : rule['iface'],
-                            'routed'      : rule['routed'],
-                            'logging'     : rule['logging']}
-            rules_profile.append(conver_rules)
-        
-        return rules_profile
+        return rules
         
     def _regenerate_file_profile(self, ufw_before, profile_before, ufw_after, description='', cmd='', policy='', direction='', iface='', routed='', logging='', proto='', from_ip='', from_port='', to_ip='', to_port=''):
         """Here there are dragons!"""
@@ -384,41 +536,27 @@ class Firewall():
         #     -        A+B         A             A+B               A    
         #     x        A+B        A+C            A+B              A+C   <-- A completed from profile_before | C completed from parameters
         # We have here profile_before + ufw_after + parameters > Just complete!
+        profile_index = self._index_rules(profile_before)
+        ufw_before_index = self._index_rules(ufw_before)
         for ufw_rule in ufw_after:
-            found = False
-            for profile_rule in profile_before:
-                if ufw_rule['ufw_rule'] == profile_rule['ufw_rule']: # Complete from previous profile
-                    found = True
-                    new_rule = {'ufw_rule'    : profile_rule['ufw_rule'],
-                                'description' : profile_rule['description'],
-                                'command'     : profile_rule['command'],
-                                'policy'      : profile_rule['policy'],
-                                'direction'   : profile_rule['direction'],
-                                'protocol'    : profile_rule['protocol'],
-                                'from_ip'     : profile_rule['from_ip'],
-                                'from_port'   : profile_rule['from_port'],
-                                'to_ip'       : profile_rule['to_ip'],
-                                'to_port'     : profile_rule['to_port'],
-                                'iface'       : profile_rule['iface'],
-                                'routed'      : profile_rule['routed'],
-                                'logging'     : profile_rule['logging']}
-            if not found:
-                if ufw_before.count(ufw_rule) == 0: # New: Complete from parameters
-                    new_rule = {'ufw_rule'    : ufw_rule['ufw_rule'],
-                                'description' : description,
-                                'command'     : cmd,
-                                'policy'      : policy,
-                                'direction'   : direction,
-                                'protocol'    : proto,
-                                'from_ip'     : from_ip,
-                                'from_port'   : from_port,
-                                'to_ip'       : to_ip,
-                                'to_port'     : to_port,
-                                'iface'       : iface,
-                                'routed'      : routed,
-                                'logging'     : logging}
-                else: # Old ufw rule: Nothing
-                    continue
+            if ufw_rule.ufw_rule in profile_index: # Complete from previous profile
+                new_rule = profile_index[ufw_rule.ufw_rule][0] # Duplicated: The first one
+            elif ufw_rule.ufw_rule not in ufw_before_index: # New: Complete from parameters
+                new_rule = Rule(ufw_rule    = ufw_rule.ufw_rule,
+                                description = description,
+                                command     = cmd,
+                                policy      = policy,
+                                direction   = direction,
+                                protocol    = proto,
+                                from_ip     = from_ip,
+                                from_port   = from_port,
+                                to_ip       = to_ip,
+                                to_port     = to_port,
+                                iface       = iface,
+                                routed      = routed,
+                                logging     = logging)
+            else: # Old ufw rule: Nothing
+                continue
                     
             final_rules.append(new_rule) # Just adding rules, a regenerate will be update the rules
         
@@ -72,12 +72,27 @@ class Frontend():
     def get_number_rules(self):
         return self.firewall.get_number_rules()
     
+    def simulate(self, direction, iface='', proto='', src='', sport='', dst='', dport='', ignore=(), routed=''):
+        return self.firewall.simulate(direction, iface, proto, src, sport, dst, dport, ignore, routed)
+    
     def add_rule(self, description, insert='', policy='', direction='', iface='', routed='', logging='', proto='', from_ip='', from_port='', to_ip='', to_port=''):
         return self.firewall.add_rule(description, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port)
     
     def delete_rule(self, num):
         return self.firewall.delete_rule(num)
     
+    def analyze_rules(self):
+        return self.firewall.analyze_rules()
+    
+    def remove_redundant_rules(self):
+        return self.firewall.remove_redundant_rules()
+    
+    def get_compacted_rules(self):
+        return self.firewall.get_compacted_rules()
+    
+    def compact_rules(self):
+        return self.firewall.compact_rules()
+    
     
     
     # LOGGING
@@ -106,10 +121,58 @@ class Frontend():
     
     
     
+    # ADDRESS LISTS > For current profile!
+    def get_address_lists(self):
+        return self.firewall.get_address_lists()
+    
+    def get_addresses(self, name):
+        return self.firewall.get_addresses(name)
+    
+    def add_address_list(self, name, policy, direction):
+        return self.firewall.add_address_list(name, policy, direction)
+    
+    def delete_address_list(self, name):
+        return self.firewall.delete_address_list(name)
+    
+    def add_addresses(self, name, addresses):
+        return self.firewall.add_addresses(name, addresses)
+    
+    def delete_addresses(self, name, addresses):
+        return self.firewall.delete_addresses(name, addresses)
+    
+    def import_address_list(self, list_file, name, policy, direction):
+        return self.firewall.import_address_list(list_file, name, policy, direction)
+    
+    
+    
+    # RULE COUNTERS
+    def get_rule_counters(self):
+        return self.firewall.get_rule_counters()
+    
+    def get_reorder_suggestion(self, counters):
+        return self.firewall.get_reorder_suggestion(counters)
+    
+    def reorder_rules(self, order):
+        return self.firewall.reorder_rules(order)
+    
+    
+    
+    # DIAGNOSTICS
+    def get_command_stats(self):
+        return self.firewall.get_command_stats()
+    
+    
+    
     # LISTENING REPORT
     def get_listening_report(self):
         return self.firewall.get_listening_report()
     
+    def get_listening_monitor(self):
+        return self.firewall.get_listening_monitor()
+    
+    def wait_listening_change(self, timeout):
+        return self.firewall.wait_listening_change(timeout)
+    
     
     
     # GUI needs
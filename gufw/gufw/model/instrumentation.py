@@ -0,0 +1,90 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import sys, math, time, threading, collections
+
+SAMPLES   = 512 # Last durations by command, for the percentiles
+MAX_DEPTH = 20  # Stack frames walked looking for the Firewall method
+
+
+class CommandStats():
+    """Wall time of the commands run by the backend, by argv[0..2]: calls, total, p50/p95/p99, how many
+       wrote to stderr and from which Firewall methods. Always on: a lock and a bounded deque by command,
+       the percentiles are just sorted when asked"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = {} # argv[0..2] > [calls, total seconds, stderr calls, durations, {Firewall method: calls}]
+
+    def record(self, cmd, seconds, stderr):
+        key = ' '.join(cmd[:3])
+        caller = self._caller()
+        with self.lock:
+            entry = self.commands.get(key)
+            if entry is None:
+                entry = [0, 0.0, 0, collections.deque(maxlen=SAMPLES), {}]
+                self.commands[key] = entry
+            entry[0] += 1
+            entry[1] += seconds
+            if stderr:
+                entry[2] += 1
+            entry[3].append(seconds)
+            entry[4][caller] = entry[4].get(caller, 0) + 1
+
+    def get_stats(self):
+        """[(command, calls, total, p50, p95, p99, stderr rate, {Firewall method: calls})], the longest total first"""
+        with self.lock:
+            entries = [(key, entry[0], entry[1], entry[2], sorted(entry[3]), dict(entry[4])) for (key, entry) in self.commands.items()]
+        stats = []
+        for (key, calls, total, stderr, durations, callers) in entries:
+            stats.append((key, calls, total, self._percentile(durations, 50), self._percentile(durations, 95), self._percentile(durations, 99), float(stderr) / calls, callers))
+        stats.sort(key=lambda stat: stat[2], reverse=True)
+        return stats
+
+    def dump(self, target):
+        """target: a file path (appended) or 1 | yes | - for stderr"""
+        lines = ['Gufw commands ' + time.strftime('%x %X'),
+                 '%-40s %7s %10s %9s %9s %9s %7s  %s' % ('command', 'calls', 'total', 'p50', 'p95', 'p99', 'stderr', 'called from')]
+        for (key, calls, total, p50, p95, p99, stderr, callers) in self.get_stats():
+            called_from = ', '.join(['%s (%d)' % (caller or '?', count) for (caller, count) in sorted(callers.items(), key=lambda item: -item[1])])
+            lines.append('%-40s %7d %9.3fs %8.1fms %8.1fms %8.1fms %6.1f%%  %s' % (key, calls, total, p50 * 1000, p95 * 1000, p99 * 1000, stderr * 100, called_from))
+        text = '\n'.join(lines) + '\n'
+        if target in ['1', 'yes', '-']:
+            sys.stderr.write(text)
+            return
+        try:
+            with open(target, 'a') as f:
+                f.write(text)
+        except Exception:
+            sys.stderr.write(text)
+
+    def _percentile(self, durations, percent):
+        # Nearest rank
+        if not durations:
+            return 0.0
+        rank = max(1, math.ceil(percent * len(durations) / 100.0))
+        return durations[min(rank, len(durations)) - 1]
+
+    def _caller(self):
+        # The nearest Firewall method up the stack, '' from elsewhere (a view thread calling the backend...)
+        frame = sys._getframe(2)
+        depth = 0
+        while frame is not None and depth < MAX_DEPTH:
+            if frame.f_code.co_filename.endswith('firewall.py') and frame.f_code.co_name[:1] != '<':
+                return frame.f_code.co_name
+            frame = frame.f_back
+            depth += 1
+        return ''
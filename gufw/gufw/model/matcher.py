@@ -0,0 +1,283 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import bisect, heapq, ipaddress
+
+PROTOCOLS = ['tcp', 'udp']
+
+
+class PortIndex():
+    """Port ranges > rule indexes. The range bounds split the ports in segments, each one knows its rules"""
+    def __init__(self, entries):
+        # entries: (index, [(first, last)]), by index
+        bounds = set()
+        for (index, ports) in entries:
+            for (first, last) in ports:
+                bounds.add(first)
+                bounds.add(last + 1)
+
+        self.bounds = sorted(bounds)
+        self.segments = [[] for bound in self.bounds]
+        for (index, ports) in entries:
+            for (first, last) in ports:
+                for segment in range(bisect.bisect_left(self.bounds, first), bisect.bisect_left(self.bounds, last + 1)):
+                    if not self.segments[segment] or self.segments[segment][-1] != index:
+                        self.segments[segment].append(index)
+
+    def lookup(self, port):
+        """Sorted lists of rule indexes"""
+        segment = bisect.bisect_right(self.bounds, port) - 1
+        if segment < 0:
+            return []
+        return [self.segments[segment]]
+
+    def overlapping(self, ports):
+        """Sorted lists of rule indexes with any port in ports [(first, last)] (repeated indexes)"""
+        found = []
+        for (first, last) in ports:
+            start = max(bisect.bisect_right(self.bounds, first) - 1, 0)
+            found.extend(self.segments[start:bisect.bisect_left(self.bounds, last + 1)])
+        return found
+
+
+class PrefixTrie():
+    """Binary trie of networks > rule indexes. A lookup walks the address bits once"""
+    def __init__(self, entries):
+        # entries: (index, ipaddress network), by index
+        self.root = [None, None, []] # [child 0, child 1, rules of this prefix]
+        for (index, network) in entries:
+            node = self.root
+            bits = int(network.network_address)
+            for i in range(network.prefixlen):
+                bit = (bits >> (network.max_prefixlen - 1 - i)) & 1
+                if node[bit] is None:
+                    node[bit] = [None, None, []]
+                node = node[bit]
+            node[2].append(index)
+
+    def lookup(self, address):
+        """Sorted lists of rule indexes"""
+        found = []
+        node = self.root
+        bits = int(address)
+        i = 0
+        while node is not None:
+            if node[2]:
+                found.append(node[2])
+            if i == address.max_prefixlen:
+                break
+            node = node[(bits >> (address.max_prefixlen - 1 - i)) & 1]
+            i += 1
+        return found
+
+    def overlapping(self, network):
+        """Sorted lists of rule indexes of the networks containing or inside network"""
+        found = []
+        node = self.root
+        bits = int(network.network_address)
+        for i in range(network.prefixlen):
+            if node[2]:
+                found.append(node[2])
+            node = node[(bits >> (network.max_prefixlen - 1 - i)) & 1]
+            if node is None:
+                return found
+        # The whole subtree
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if node[2]:
+                found.append(node[2])
+            pending.extend([child for child in node[:2] if child is not None])
+        return found
+
+
+class RuleTable():
+    """The rules of one direction, IP version and protocol. They are grouped by the fields they
+       restrict (port, destination, source), each group indexed by those fields only"""
+    def __init__(self, indexes, rules):
+        self.indexes = indexes
+        self.groups = {}
+        for i in indexes:
+            rule = rules[i]
+            self.groups.setdefault((rule.dport is not None, rule.dst is not None, rule.src is not None), []).append(i)
+
+        self.lookups = {}
+        for ((dport, dst, src), group) in self.groups.items():
+            self.lookups[(dport, dst, src)] = [
+                dport and PortIndex([(i, rules[i].dport) for i in group]),
+                dst and PrefixTrie([(i, rules[i].dst) for i in group]),
+                src and PrefixTrie([(i, rules[i].src) for i in group])]
+
+    def lookup(self, dport, dst, src):
+        """Sorted lists of candidate rule indexes"""
+        found = []
+        for (key, group) in self.groups.items():
+            if [1 for (restricted, value) in zip(key, [dport, dst, src]) if restricted and value is None]:
+                continue
+            best = [group]
+            for (index, value) in zip(self.lookups[key], [dport, dst, src]):
+                if not index:
+                    continue
+                lists = index.lookup(value)
+                if sum([len(indexes) for indexes in lists]) < sum([len(indexes) for indexes in best]):
+                    best = lists
+            found.extend(best)
+        return found
+
+    def overlapping(self, dport, dst, src):
+        """Sorted lists of the rule indexes that could share traffic with these fields (None = any value)"""
+        found = []
+        for (key, group) in self.groups.items():
+            best = [group]
+            for (index, value) in zip(self.lookups[key], [dport, dst, src]):
+                if not index or value is None:
+                    continue
+                lists = index.overlapping(value)
+                if sum([len(indexes) for indexes in lists]) < sum([len(indexes) for indexes in best]):
+                    best = lists
+            found.extend(best)
+        return found
+
+
+class RuleMatcher():
+    """Which rule matches a packet or socket, from the parsed Rule objects (ufw order)
+       A query field left as None (any port, address, interface or protocol) just matches
+       the rules that don't restrict it"""
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.unmatchable = [] # Application rules: ports not known by Gufw
+        self.tables = {}
+
+        groups = {}
+        for (i, rule) in enumerate(self.rules):
+            if rule.dapp or rule.sapp:
+                self.unmatchable.append(i)
+                continue
+            groups.setdefault((rule.flow, rule.v6), []).append(i)
+
+        for ((flow, v6), indexes) in groups.items():
+            protocols = set(PROTOCOLS + [self.rules[i].proto for i in indexes]) - set(['any'])
+            for protocol in protocols:
+                self.tables[(flow, v6, protocol)] = RuleTable([i for i in indexes if self.rules[i].proto in [protocol, 'any']], self.rules)
+            self.tables[(flow, v6, 'any')] = RuleTable([i for i in indexes if self.rules[i].proto == 'any'], self.rules)
+
+    def match(self, flow, proto=None, dst=None, dport=None, src=None, sport=None, iface_in='', iface_out='', v6=False):
+        """Returns (rule number, rule) of the first matching rule or (0, None)"""
+        for i in self.candidates(flow, proto, dst, dport, src, sport, iface_in, iface_out, v6):
+            return (i + 1, self.rules[i])
+        return (0, None)
+
+    def candidates(self, flow, proto=None, dst=None, dport=None, src=None, sport=None, iface_in='', iface_out='', v6=False):
+        """The matching rule indexes (from 0), in order (generator)"""
+        table = self.tables.get((flow, v6, proto or 'any'))
+        if table is None:
+            table = self.tables.get((flow, v6, 'any'))
+        if table is None:
+            return
+        if isinstance(dst, str):
+            dst = ipaddress.ip_address(dst)
+        if isinstance(src, str):
+            src = ipaddress.ip_address(src)
+
+        # The best index of every group of rules, then the other fields rule by rule
+        candidates = table.lookup(dport, dst, src)
+        for i in heapq.merge(*candidates):
+            rule = self.rules[i]
+            if rule.dport is not None and (dport is None or not self._in_ports(dport, rule.dport)):
+                continue
+            if rule.sport is not None and (sport is None or not self._in_ports(sport, rule.sport)):
+                continue
+            if rule.dst is not None and (dst is None or dst not in rule.dst):
+                continue
+            if rule.src is not None and (src is None or src not in rule.src):
+                continue
+            if rule.iface_in and rule.iface_in != iface_in:
+                continue
+            if rule.iface_out and rule.iface_out != iface_out:
+                continue
+            yield i
+
+    def partial(self, flow, proto=None, dst=None, dport=None, v6=False, before=0):
+        """The indexes (from 0) of the rules before the rule number before (0 = all) that match dport
+           just on an incoming interface or, for any dst, on some destinations, in order (generator)"""
+        table = self.tables.get((flow, v6, proto or 'any'))
+        if table is None:
+            return
+        if isinstance(dst, str):
+            dst = ipaddress.ip_address(dst)
+        ports = None
+        if dport is not None:
+            ports = [(dport, dport)]
+
+        last = -1
+        for i in heapq.merge(*table.overlapping(ports, None, None)):
+            if i == last:
+                continue
+            last = i
+            if before and i >= before - 1:
+                return
+            rule = self.rules[i]
+            if rule.src is not None or rule.sport is not None or rule.iface_out:
+                continue
+            if rule.dport is not None and (dport is None or not self._in_ports(dport, rule.dport)):
+                continue
+            if rule.dst is not None and dst is not None and dst not in rule.dst: # Never
+                continue
+            if rule.iface_in or (rule.dst is not None and dst is None):
+                yield i
+
+    def overlapping(self, rule):
+        """The indexes (from 0) of the rules sharing some traffic with rule, in order (generator)"""
+        if rule.dapp or rule.sapp:
+            return
+        tables = [table for (key, table) in self.tables.items() if key[:2] == (rule.flow, rule.v6) and (rule.proto == 'any' or key[2] in [rule.proto, 'any'])]
+        candidates = []
+        for table in tables:
+            candidates.extend(table.overlapping(rule.dport, rule.dst, rule.src))
+
+        last = -1
+        for i in heapq.merge(*candidates):
+            if i == last:
+                continue
+            last = i
+            other = self.rules[i]
+            if rule.dport is not None and other.dport is not None and not self._overlap_ports(rule.dport, other.dport):
+                continue
+            if rule.dst is not None and other.dst is not None and not rule.dst.overlaps(other.dst):
+                continue
+            if rule.src is not None and other.src is not None and not rule.src.overlaps(other.src):
+                continue
+            if rule.sport is not None and other.sport is not None and not self._overlap_ports(rule.sport, other.sport):
+                continue
+            if rule.iface_in and other.iface_in and rule.iface_in != other.iface_in:
+                continue
+            if rule.iface_out and other.iface_out and rule.iface_out != other.iface_out:
+                continue
+            yield i
+
+    def _overlap_ports(self, ports, other_ports):
+        for (first, last) in ports:
+            for (other_first, other_last) in other_ports:
+                if first <= other_last and other_first <= last:
+                    return True
+        return False
+
+    def _in_ports(self, port, ports):
+        for (first, last) in ports:
+            if first <= port <= last:
+                return True
+        return False
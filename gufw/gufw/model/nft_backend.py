@@ -0,0 +1,540 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import os, re, time, shutil, subprocess, configparser, ipaddress
+from gufw.model.ufw_backend   import Backend
+from gufw.model.snapshot      import FirewallSnapshot
+from gufw.model.user_rules    import UserRules
+from gufw.model.rule          import Rule
+from gufw.model.matcher       import RuleMatcher
+from gufw.model.address_lists import AddressLists
+
+PORTS_RE = re.compile(r'^[0-9]+(:[0-9]+)?(,[0-9]+(:[0-9]+)?)*$')
+VERDICTS = {'allow': 'accept', 'deny': 'drop', 'reject': 'jump reject'}
+POLICIES = {'allow': 'ACCEPT', 'deny': 'DROP', 'reject': 'REJECT'}
+FLOWS    = {'in': 'input', 'out': 'output', 'fwd': 'forward'}
+
+
+class NftBackend(Backend):
+    """The Gufw rules straight into an own nftables table (inet gufw), without ufw.
+       The rules are kept as ufw tuples (<GUFW_PATH>/nftables/user.rules & user6.rules), so they are
+       listed, numbered and stored in the profiles as ufw does. Every change compiles the whole table
+       and loads it in one 'nft -f' transaction: on error, the previous table and rules stay.
+       Runs of simple rules (just ports or just an address) are grouped into verdict maps, a single
+       lookup instead of a rule by rule walk, whenever no rule between them shares traffic.
+       Boot: include <GUFW_PATH>/nftables/gufw.nft from /etc/nftables.conf"""
+    NFT_PATH = '/usr/sbin/nft'
+    TABLE    = 'gufw'
+
+    def __init__(self):
+        Backend.__init__(self)
+        self.NFT_DIR    = os.path.join(self.GUFW_PATH, 'nftables')
+        self.NFT_RULES  = os.path.join(self.NFT_DIR, 'user.rules')
+        self.NFT_RULES6 = os.path.join(self.NFT_DIR, 'user6.rules')
+        self.NFT_STATE  = os.path.join(self.NFT_DIR, 'state.cfg')
+        self.NFT_SCRIPT = os.path.join(self.NFT_DIR, 'gufw.nft')
+        self.address_lists = AddressLists(os.path.join(self.GUFW_PATH, 'address_lists'), ipset=False) # Sets of the table
+        self.counters = None
+        self.user_rules = UserRules()
+        self._read_state()
+
+    def is_available(self):
+        return os.path.isfile(self.NFT_PATH) or shutil.which('nft') is not None
+
+    def _new_engine(self):
+        return None # No ufw
+
+    # STATE
+    def _read_state(self):
+        self.state = {'status': 'disabled', 'incoming': 'deny', 'outgoing': 'allow', 'routed': 'deny', 'logging': 'low'}
+        cfg = configparser.ConfigParser()
+        if cfg.read([self.NFT_STATE]) and cfg.has_section('fwBasic'):
+            for key in self.state:
+                if cfg.has_option('fwBasic', key):
+                    self.state[key] = cfg.get('fwBasic', key)
+
+        self.tuples = {False: [], True: []} # Tuple lines by IPv6, in order
+        for (path, v6) in [(self.NFT_RULES, False), (self.NFT_RULES6, True)]:
+            for line in self._read_file(path).split('\n'):
+                if line.startswith(UserRules.TUPLE):
+                    self.tuples[v6].append(line)
+
+    def _write_state(self):
+        if not os.path.exists(self.NFT_DIR):
+            os.makedirs(self.NFT_DIR)
+        cfg = configparser.ConfigParser()
+        cfg.add_section('fwBasic')
+        for (key, value) in self.state.items():
+            cfg.set('fwBasic', key, value)
+        with open(self.NFT_STATE, 'w') as f:
+            cfg.write(f)
+        for (path, v6) in [(self.NFT_RULES, False), (self.NFT_RULES6, True)]:
+            with open(path, 'w') as f:
+                f.write(''.join([line + '\n' for line in self.tuples[v6]]))
+
+    def _commit(self, previous_state, previous_tuples):
+        """Loads the new state. Returns the nft error, with the previous state back, or ''"""
+        error = self._apply()
+        if error:
+            (self.state, self.tuples) = (previous_state, previous_tuples)
+        else:
+            self._write_state()
+        self.invalidate_snapshot()
+        return error
+
+    def _backup(self):
+        return (dict(self.state), {False: list(self.tuples[False]), True: list(self.tuples[True])})
+
+    def get_snapshot(self):
+        # The same texts that ufw would show
+        snapshot = self.snapshot
+        if snapshot is None:
+            status = 'Status: inactive'
+            if self.state['status'] == 'enabled':
+                status = 'Status: active'
+            default = '\n'.join(['DEFAULT_INPUT_POLICY="'   + POLICIES.get(self.state['incoming'], 'DROP') + '"',
+                                 'DEFAULT_OUTPUT_POLICY="'  + POLICIES.get(self.state['outgoing'], 'ACCEPT') + '"',
+                                 'DEFAULT_FORWARD_POLICY="' + POLICIES.get(self.state['routed'], 'DROP') + '"'])
+            sysctl = '#net/ipv4/ip_forward=1'
+            if self._read_file('/proc/sys/net/ipv4/ip_forward').strip() == '1':
+                sysctl = 'net/ipv4/ip_forward=1'
+            user_rules = self.user_rules.get_rules('\n'.join(self.tuples[False]), '\n'.join(self.tuples[True]))
+            snapshot = FirewallSnapshot(status, default, 'LOGLEVEL=' + self.state['logging'], sysctl, user_rules)
+            self.snapshot = snapshot
+        return snapshot
+
+    # FIREWALL
+    def set_status(self, status):
+        (state, tuples) = self._backup()
+        self.state['status'] = 'enabled' if status else 'disabled'
+        self._commit(state, tuples)
+
+    def set_policy(self, policy, value):
+        if policy not in ['incoming', 'outgoing', 'routed'] or value not in POLICIES:
+            return
+        (state, tuples) = self._backup()
+        self.state[policy] = value
+        self._commit(state, tuples)
+
+    def set_ufw_logging(self, logging):
+        if logging not in ['off', 'low', 'medium', 'high', 'full']:
+            return
+        (state, tuples) = self._backup()
+        self.state['logging'] = logging
+        self._commit(state, tuples)
+
+    def reset_fw(self):
+        # As ufw: default policies, no rules & disabled
+        (state, tuples) = self._backup()
+        self.state = {'status': 'disabled', 'incoming': 'deny', 'outgoing': 'allow', 'routed': 'deny', 'logging': 'low'}
+        self.tuples = {False: [], True: []}
+        self._commit(state, tuples)
+
+    # RULES
+    def add_rule(self, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        cmd_rule = ' '.join(self._compose_rule_cmd(insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port))
+        (new_tuples, error) = self._get_tuples(policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port)
+        if error:
+            return [cmd_rule, error]
+
+        position = {False: len(self.tuples[False]), True: len(self.tuples[True])}
+        if insert:
+            num = int(insert) - 1
+            if num < 0 or num >= len(self.tuples[False]) + len(self.tuples[True]):
+                return [cmd_rule, "ERROR: Invalid position '" + str(insert) + "'"]
+            if num < len(self.tuples[False]): # Before an IPv4 rule: IPv6 on top
+                position = {False: num, True: 0}
+            else:
+                position[True] = min(num - len(self.tuples[False]), len(self.tuples[True]))
+
+        (state, tuples) = self._backup()
+        result = []
+        for (v6, line) in new_tuples:
+            suffix = ' (v6)' if v6 else ''
+            if line in self.tuples[v6]:
+                result.append('Skipping adding existing rule' + suffix)
+                continue
+            self.tuples[v6].insert(position[v6], line)
+            position[v6] += 1
+            result.append(('Rule inserted' if insert else 'Rule added') + suffix)
+
+        error = self._commit(state, tuples)
+        if error:
+            result = [error]
+        return [cmd_rule, '\n'.join(result)] # cmd | result
+
+    def set_rules(self, rules):
+        """Same as Backend.set_rules(), always in one transaction"""
+        current = [(False, line) for line in self.tuples[False]] + [(True, line) for line in self.tuples[True]]
+        (state, tuples) = self._backup()
+        self.tuples = {False: [], True: []}
+        for rule in rules:
+            if isinstance(rule, int):
+                (v6, line) = current[rule - 1]
+                self.tuples[v6].append(line)
+                continue
+            (new_tuples, error) = self._get_tuples(rule.policy, rule.direction, rule.iface, rule.routed, rule.logging, rule.protocol, rule.from_ip, rule.from_port, rule.to_ip, rule.to_port)
+            family = self._rule_family(rule)
+            for (v6, line) in new_tuples:
+                if family and family != ('v6' if v6 else 'v4'):
+                    continue
+                if line not in self.tuples[v6]:
+                    self.tuples[v6].append(line)
+
+        error = self._commit(state, tuples)
+        return [[self.NFT_PATH + ' -f ' + self.NFT_SCRIPT, error or 'Rules updated']]
+
+    def can_reorder(self):
+        return True
+
+    def delete_rule(self, num):
+        current = [(False, i) for i in range(len(self.tuples[False]))] + [(True, i) for i in range(len(self.tuples[True]))]
+        num = int(num)
+        if num < 1 or num > len(current):
+            return ['delete ' + str(num), 'ERROR: Could not find rule ' + str(num)]
+        (state, tuples) = self._backup()
+        (v6, i) = current[num - 1]
+        del self.tuples[v6][i]
+        error = self._commit(state, tuples)
+        return [self.NFT_PATH + ' -f ' + self.NFT_SCRIPT, error or 'Rule deleted'] # cmd | result
+
+    def get_rule_counters(self):
+        return None
+
+    def _get_tuples(self, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        """Parameters of Backend.add_rule() > ([(v6, ufw tuple line)], error)"""
+        if policy not in ['allow', 'deny', 'reject', 'limit'] or direction not in ['in', 'out']:
+            return ([], 'ERROR: Invalid rule')
+
+        protocol = proto or 'any'
+        for port in [from_port, to_port]:
+            if '/tcp' in port:
+                protocol = 'tcp'
+            elif '/udp' in port:
+                protocol = 'udp'
+        (sport, dport) = (from_port.split('/')[0] or 'any', to_port.split('/')[0] or 'any')
+        for port in [sport, dport]:
+            if port == 'any':
+                continue
+            if not PORTS_RE.match(port):
+                return ([], 'ERROR: Applications are not supported by the nftables backend')
+            numbers = [int(number) for number in re.split('[,:]', port)]
+            if [number for number in numbers if number < 1 or number > 65535]:
+                return ([], 'ERROR: Bad port')
+            if (',' in port or ':' in port) and protocol not in ['tcp', 'udp']:
+                return ([], "ERROR: Must specify 'tcp' or 'udp' with multiple ports")
+
+        addresses = []
+        for (address, error) in [(from_ip, 'ERROR: Bad source address'), (to_ip, 'ERROR: Bad destination address')]:
+            if not address or address == 'any':
+                addresses.append(None)
+                continue
+            try:
+                network = ipaddress.ip_network(address, strict=False)
+            except ValueError:
+                return ([], error)
+            addresses.append(network)
+        versions = set([network.version for network in addresses if network is not None])
+        if len(versions) > 1:
+            return ([], "ERROR: Mixed IP versions for 'from' and 'to'")
+
+        action = policy
+        if logging:
+            action += '_' + logging
+        if routed:
+            action = 'route:' + action
+
+        # direction[_iface][!other_direction_iface]
+        other = 'out' if direction == 'in' else 'in'
+        iface_field = direction
+        if iface:
+            iface_field += '_' + iface
+        if routed:
+            iface_field += '!' + other + '_' + routed
+
+        new_tuples = []
+        for v6 in [False, True]:
+            if versions and versions != set([6 if v6 else 4]):
+                continue
+            (src, dst) = [self._tuple_address(network, v6) for network in addresses]
+            fields = [action, protocol, dport, dst, sport, src, iface_field]
+            new_tuples.append((v6, UserRules.TUPLE + ' ' + ' '.join(fields)))
+        return (new_tuples, '')
+
+    def _tuple_address(self, network, v6):
+        if network is None:
+            return '::/0' if v6 else '0.0.0.0/0'
+        if network.prefixlen == network.max_prefixlen:
+            return str(network.network_address)
+        return str(network)
+
+    # ADDRESS LISTS: sets of the table
+    def add_addresses(self, profile, name, addresses):
+        result = Backend.add_addresses(self, profile, name, addresses)
+        self._reload()
+        return result
+
+    def delete_addresses(self, profile, name, addresses):
+        error = Backend.delete_addresses(self, profile, name, addresses)
+        self._reload()
+        return error
+
+    def _reload(self):
+        self._apply()
+        self.invalidate_snapshot()
+
+    # NFTABLES
+    def _apply(self):
+        """Replaces the table in one transaction. Returns the nft error or ''"""
+        script = self._compile()
+        try:
+            if not os.path.exists(self.NFT_DIR):
+                os.makedirs(self.NFT_DIR)
+            with open(self.NFT_SCRIPT, 'w') as f:
+                f.write(script)
+            nft = self.NFT_PATH if os.path.isfile(self.NFT_PATH) else 'nft'
+            start = time.perf_counter()
+            proc = subprocess.Popen([nft, '-f', '-'], shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={'LANG':'C', 'PATH':'/usr/sbin:/sbin:/usr/bin:/bin'})
+            stdout, stderr = proc.communicate(script.encode('utf-8'))
+            self.command_stats.record([nft, '-f', '-'], time.perf_counter() - start, stderr)
+        except Exception as e: # Not installed
+            return str(e)
+        if proc.returncode:
+            return stderr.decode('utf-8', 'replace').strip()
+        return ''
+
+    def _compile(self):
+        """nft script: the previous table out and the new one in, as a single transaction"""
+        lines = ['table inet ' + self.TABLE, 'delete table inet ' + self.TABLE] # Created first: delete can't fail
+        if self.state['status'] != 'enabled':
+            return '\n'.join(lines) + '\n'
+
+        lines.append('table inet ' + self.TABLE + ' {')
+        lines.extend(['    chain reject {', '        meta l4proto tcp reject with tcp reset', '        reject', '    }'])
+
+        hooks = self._compile_address_lists(lines)
+        for v6 in [False, True]:
+            (user, user6) = ('\n'.join(self.tuples[False]), '')
+            if v6:
+                (user, user6) = ('', '\n'.join(self.tuples[True]))
+            RuleCompiler([Rule(ufw_rule) for ufw_rule in self.user_rules.get_rules(user, user6)], v6).compile(lines)
+
+        logging = self.state['logging'] != 'off'
+        for (flow, policy) in [('in', self.state['incoming']), ('out', self.state['outgoing']), ('fwd', self.state['routed'])]:
+            lines.append('    chain ' + FLOWS[flow] + ' {')
+            lines.append('        type filter hook ' + FLOWS[flow] + ' priority filter; policy ' + ('accept' if policy == 'allow' else 'drop') + ';')
+            lines.append('        ct state established,related accept')
+            lines.append('        ct state invalid drop')
+            if flow == 'in':
+                lines.append('        iifname "lo" accept')
+                lines.append('        icmp type { destination-unreachable, time-exceeded, parameter-problem, echo-request } accept')
+                lines.append('        icmpv6 type { destination-unreachable, packet-too-big, time-exceeded, parameter-problem, echo-request, nd-router-advert, nd-neighbor-solicit, nd-neighbor-advert } accept')
+                lines.append('        udp sport 67 udp dport 68 accept')
+                lines.append('        udp sport 547 udp dport 546 accept')
+            elif flow == 'out':
+                lines.append('        oifname "lo" accept')
+            lines.extend(['        ' + hook for hook in hooks[flow]])
+            lines.append('        meta nfproto ipv4 jump ' + flow + '4')
+            lines.append('        meta nfproto ipv6 jump ' + flow + '6')
+            if logging and policy != 'allow':
+                lines.append('        limit rate 3/minute burst 10 packets log prefix "[GUFW BLOCK] "')
+            if policy == 'reject':
+                lines.append('        jump reject')
+            lines.append('    }')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    def _compile_address_lists(self, lines):
+        # A set by list & IP version, matched before the rules (as the ufw before.rules hooks)
+        hooks = {'in': [], 'out': [], 'fwd': []}
+        profile = self.get_cfg_value('Profile')
+        for (name, policy, direction) in self.address_lists.get_lists(profile):
+            networks = {4: [], 6: []}
+            for address in self.address_lists.get_addresses(profile, name):
+                try:
+                    network = ipaddress.ip_network(address, strict=False)
+                except ValueError:
+                    continue
+                networks[network.version].append(network)
+            for (version, family, set_type) in [(4, 'ip', 'ipv4_addr'), (6, 'ip6', 'ipv6_addr')]:
+                set_name = 'list' + str(version) + '_' + name
+                lines.append('    set ' + set_name + ' {')
+                lines.append('        type ' + set_type + '; flags interval;')
+                elements = [str(network) for network in ipaddress.collapse_addresses(networks[version])]
+                if elements:
+                    lines.append('        elements = { ' + ', '.join(elements) + ' }')
+                lines.append('    }')
+                match = ' saddr ' if direction == 'in' else ' daddr '
+                hooks[direction].append(family + match + '@' + set_name + ' ' + VERDICTS[policy])
+        return hooks
+
+
+class RuleCompiler():
+    """The rules of an IP version into their chains (in4, out4, fwd4 or in6...), in order.
+       A simple rule (only destination ports, or only the remote address) joins the last verdict map
+       of its kind when no rule placed after that map shares traffic with it: same verdicts"""
+    def __init__(self, rules, v6):
+        self.rules = rules
+        self.v6 = v6
+        self.family = 'ip6' if v6 else 'ip'
+        self.matcher = RuleMatcher(rules)
+
+    def compile(self, lines):
+        for flow in ['in', 'out', 'fwd']:
+            chain = flow + ('6' if self.v6 else '4')
+            items = self._group([i for (i, rule) in enumerate(self.rules) if rule.flow == flow])
+            body = []
+            for (n, item) in enumerate(items):
+                if isinstance(item, int):
+                    body.extend(self._statements(self.rules[item], chain + '_limit' + str(n)))
+                else:
+                    body.extend(self._maps(item, chain + '_' + str(n), lines))
+            lines.append('    chain ' + chain + ' {')
+            lines.extend(['        ' + statement for statement in body])
+            lines.append('    }')
+
+    def _group(self, indexes):
+        """[rule index | verdict map {'kind', 'entries': {key type: [(key, verdict)]}}]"""
+        items = []
+        position = {} # rule index > item position
+        last_map = {} # kind > item position
+        for j in indexes:
+            rule = self.rules[j]
+            kind = self._kind(rule)
+            if not kind:
+                position[j] = len(items)
+                items.append(j)
+                continue
+
+            keys = self._keys(rule, kind)
+            target = last_map.get(kind)
+            if target is not None:
+                for i in self.matcher.overlapping(rule):
+                    if i >= j:
+                        break
+                    if i in position and position[i] > target: # Something in between
+                        target = None
+                        break
+            if target is not None and not self._add_keys(items[target], keys, rule.action):
+                target = None
+            if target is None:
+                target = len(items)
+                last_map[kind] = target
+                items.append({'kind': kind, 'entries': {}})
+                self._add_keys(items[target], keys, rule.action)
+            position[j] = target
+        return items
+
+    def _kind(self, rule):
+        if rule.log or rule.action not in VERDICTS or rule.iface_in or rule.iface_out or rule.sport is not None or rule.dapp or rule.sapp:
+            return ''
+        if rule.dport is not None and rule.src is None and rule.dst is None and rule.proto in ['tcp', 'udp', 'any']:
+            return 'dport'
+        remote = rule.dst if rule.flow == 'out' else rule.src
+        local = rule.src if rule.flow == 'out' else rule.dst
+        if rule.dport is None and rule.proto == 'any' and remote is not None and local is None:
+            return 'addr'
+        return ''
+
+    def _keys(self, rule, kind):
+        """[(key type, key)]: ports as (first, last), addresses as networks"""
+        if kind == 'dport':
+            protos = [rule.proto] if rule.proto != 'any' else ['tcp', 'udp']
+            return [(proto, ports) for proto in protos for ports in rule.dport]
+        if rule.flow == 'out':
+            return [('daddr', rule.dst)]
+        return [('saddr', rule.src)]
+
+    def _add_keys(self, item, keys, action):
+        """All or nothing. The same key again is left out (the first rule wins); partially overlapping keys can't join"""
+        new_keys = []
+        for (key_type, key) in keys:
+            same = False
+            for (other, verdict) in item['entries'].get(key_type, []):
+                if other == key:
+                    same = True
+                elif self._overlap(key, other):
+                    return False
+            if not same:
+                new_keys.append((key_type, key))
+        for (key_type, key) in new_keys:
+            item['entries'].setdefault(key_type, []).append((key, VERDICTS[action]))
+        return True
+
+    def _overlap(self, key, other):
+        if isinstance(key, tuple):
+            return key[0] <= other[1] and other[0] <= key[1]
+        return key.overlaps(other)
+
+    def _maps(self, item, name, lines):
+        statements = []
+        for (key_type, entries) in sorted(item['entries'].items()):
+            map_name = name + '_' + key_type
+            if key_type in ['tcp', 'udp']:
+                (map_type, match) = ('inet_service', key_type + ' dport')
+                elements = [self._ports([ports]) + ' : ' + verdict for (ports, verdict) in entries]
+            else:
+                (map_type, match) = ('ipv6_addr' if self.v6 else 'ipv4_addr', self.family + ' ' + key_type)
+                elements = [str(network) + ' : ' + verdict for (network, verdict) in entries]
+            lines.append('    map ' + map_name + ' {')
+            lines.append('        type ' + map_type + ' : verdict; flags interval;')
+            lines.append('        elements = { ' + ', '.join(elements) + ' }')
+            lines.append('    }')
+            statements.append(match + ' vmap @' + map_name)
+        return statements
+
+    def _statements(self, rule, meter):
+        matches = []
+        if rule.iface_in:
+            matches.append('iifname "' + rule.iface_in + '"')
+        if rule.iface_out:
+            matches.append('oifname "' + rule.iface_out + '"')
+        if rule.src is not None:
+            matches.append(self.family + ' saddr ' + str(rule.src))
+        if rule.dst is not None:
+            matches.append(self.family + ' daddr ' + str(rule.dst))
+        if rule.sport is not None or rule.dport is not None:
+            header = rule.proto
+            if rule.proto not in ['tcp', 'udp']:
+                matches.append('meta l4proto { tcp, udp }')
+                header = 'th'
+            if rule.sport is not None:
+                matches.append(header + ' sport ' + self._ports(rule.sport))
+            if rule.dport is not None:
+                matches.append(header + ' dport ' + self._ports(rule.dport))
+        elif rule.proto != 'any':
+            matches.append('meta l4proto ' + rule.proto)
+        match = ' '.join(matches)
+
+        statements = []
+        if rule.log:
+            log = 'log prefix "[GUFW ' + rule.action.upper() + '] "'
+            if rule.log == 'log':
+                log = 'ct state new ' + log
+            statements.append(' '.join([match, log]).strip())
+        if rule.action == 'limit': # As ufw: 6 new connections in 30 seconds from the same address
+            statements.append(' '.join([match, 'ct state new meter ' + meter + ' { ' + self.family + ' saddr limit rate over 12/minute burst 6 packets } drop']).strip())
+            statements.append(' '.join([match, 'accept']).strip())
+        else:
+            statements.append(' '.join([match, VERDICTS.get(rule.action, 'drop')]).strip())
+        return statements
+
+    def _ports(self, ports):
+        values = [str(first) if first == last else str(first) + '-' + str(last) for (first, last) in ports]
+        if len(values) == 1:
+            return values[0]
+        return '{ ' + ', '.join(values) + ' }'
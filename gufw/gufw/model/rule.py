@@ -0,0 +1,148 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import re, ipaddress
+
+RULE_RE    = re.compile(r'^(.*?) (ALLOW|DENY|REJECT|LIMIT) (IN|OUT|FWD) (.*)$')
+ATTRIBS_RE = re.compile(r' \(((?:log|log-all|out)(?:, (?:log|log-all|out))*)\)$')
+IFACE_RE   = re.compile(r' on (\S+)$')
+PORTS_RE   = re.compile(r'^([0-9][0-9,:]*)(?:/(\w+))?$')
+
+
+class Rule():
+    """A rule, shared by reference between the backend, Firewall and the GUI.
+       The Gufw fields come from the profile (empty for rules added out of Gufw).
+       The parsed fields are read from the ufw rule text the first time one is used"""
+    FIELDS = ['ufw_rule', 'description', 'command', 'policy', 'direction', 'protocol',
+              'from_ip', 'from_port', 'to_ip', 'to_port', 'iface', 'routed', 'logging']
+    PARSED = ['action', 'flow', 'proto', 'v6', 'log', 'out',
+              'src', 'sport', 'sapp', 'dst', 'dport', 'dapp', 'iface_in', 'iface_out']
+    __slots__ = FIELDS + PARSED
+
+    def __init__(self, ufw_rule='', description='', command='', policy='', direction='', protocol='', from_ip='', from_port='', to_ip='', to_port='', iface='', routed='', logging=''):
+        self.ufw_rule    = ufw_rule
+        self.description = description
+        self.command     = command
+        self.policy      = policy
+        self.direction   = direction
+        self.protocol    = protocol
+        self.from_ip     = from_ip
+        self.from_port   = from_port
+        self.to_ip       = to_ip
+        self.to_port     = to_port
+        self.iface       = iface
+        self.routed      = routed
+        self.logging     = logging
+
+    def __getattr__(self, name):
+        # Just called for the parsed fields not set yet
+        if name in Rule.PARSED:
+            self._parse()
+            return object.__getattribute__(self, name)
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return 'Rule(' + repr(self.ufw_rule) + ')'
+
+    def _parse(self):
+        self.action    = ''    # allow | deny | reject | limit
+        self.flow      = ''    # in | out | fwd
+        self.proto     = 'any'
+        self.v6        = '(v6)' in self.ufw_rule
+        self.log       = ''    # log | log-all
+        self.out       = False
+        self.src       = None  # None = Anywhere
+        self.sport     = None  # None = any port | [(first, last)]
+        self.sapp      = ''
+        self.dst       = None
+        self.dport     = None
+        self.dapp      = ''
+        self.iface_in  = ''
+        self.iface_out = ''
+
+        text = self.ufw_rule.split(' # ')[0] # Without comment
+        match = RULE_RE.match(text)
+        if not match:
+            return
+        (dst, action, flow, src) = match.groups()
+        self.action = action.lower()
+        self.flow = flow.lower()
+
+        attribs = ATTRIBS_RE.search(src)
+        if attribs:
+            src = src[:attribs.start()]
+            for attrib in attribs.group(1).split(', '):
+                if attrib == 'out':
+                    self.out = True
+                else:
+                    self.log = attrib
+
+        (self.dst, self.dport, self.dapp, dst_iface, dst_proto) = self._parse_location(dst)
+        (self.src, self.sport, self.sapp, src_iface, src_proto) = self._parse_location(src)
+        # ufw prints '(v6)' just for Anywhere (::/0)
+        for address in [self.dst, self.src]:
+            if address is not None and address.version == 6:
+                self.v6 = True
+        self.proto = dst_proto or src_proto or 'any'
+        if self.flow == 'fwd': # Forwarded: to the out interface, from the in interface
+            (self.iface_in, self.iface_out) = (src_iface, dst_iface)
+        else:
+            (self.iface_in, self.iface_out) = (dst_iface, src_iface)
+
+    def _parse_location(self, location):
+        """'[address] [port[/proto] | application] [(v6)] [on iface]' or 'Anywhere[/proto] [(v6)] [on iface]'"""
+        address = ports = None
+        app = iface = proto = ''
+
+        match = IFACE_RE.search(location)
+        if match:
+            iface = match.group(1)
+            location = location[:match.start()]
+        if location.endswith(' (v6)'):
+            location = location[:-len(' (v6)')]
+
+        if location.startswith('Anywhere'):
+            if location.startswith('Anywhere/'):
+                proto = location[len('Anywhere/'):]
+            return (address, ports, app, iface, proto)
+
+        fields = location.split(' ', 1)
+        try:
+            address = ipaddress.ip_network(fields[0], strict=False)
+            fields = fields[1:]
+        except ValueError:
+            pass
+        if not fields:
+            return (address, ports, app, iface, proto)
+
+        match = PORTS_RE.match(fields[0])
+        if match:
+            ports = self._parse_ports(match.group(1))
+            proto = match.group(2) or ''
+        else:
+            app = fields[0]
+        return (address, ports, app, iface, proto)
+
+    def _parse_ports(self, ports):
+        ranges = []
+        for port in ports.split(','):
+            if ':' in port:
+                (first, last) = port.split(':', 1)
+                ranges.append((int(first), int(last)))
+            elif port:
+                ranges.append((int(port), int(port)))
+        return ranges
@@ -0,0 +1,70 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+from gufw.model.rule import Rule
+
+
+class FirewallSnapshot():
+    """Firewall state from one 'ufw status numbered' + the ufw config files (+ the ufw rules files if disabled)"""
+    def __init__(self, ufw_status, ufw_default, ufw_conf, ufw_sysctl, user_rules=None):
+        self.status = 'Status: active' in ufw_status
+        if user_rules is None:
+            self.rules = self._parse_rules(ufw_status)
+        else: # From user.rules & user6.rules
+            self.rules = [Rule(ufw_rule) for ufw_rule in user_rules]
+        self.policies = {'incoming': self._parse_policy(ufw_default, 'DEFAULT_INPUT_POLICY'),
+                         'outgoing': self._parse_policy(ufw_default, 'DEFAULT_OUTPUT_POLICY'),
+                         'routed'  : self._parse_routed(ufw_default, ufw_sysctl)}
+        self.logging = self._parse_logging(ufw_conf)
+
+    def _grep(self, text, pattern):
+        return '\n'.join([line for line in text.split('\n') if pattern in line])
+
+    def _parse_rules(self, ufw_status):
+        rules = []
+        for line in ufw_status.split('\n'):
+            if line and 'ALLOW' in line or 'DENY' in line or 'LIMIT' in line or 'REJECT' in line:
+                rule = line.split('] ')
+                rules.append(Rule(' '.join(rule[1].split())))
+        return rules
+
+    def _parse_policy(self, ufw_default, key):
+        policy = self._grep(ufw_default, key)
+        if 'ACCEPT' in policy:
+            return 'allow'
+        elif 'DROP' in policy:
+            return 'deny'
+        elif 'REJECT' in policy:
+            return 'reject'
+
+    def _parse_routed(self, ufw_default, ufw_sysctl):
+        routed_status = self._grep(ufw_sysctl, 'net/ipv4/ip_forward=').replace(" ", "")
+        if "#net/ipv4/ip_forward=1" in routed_status:
+            return 'disabled'
+        return self._parse_policy(ufw_default, 'DEFAULT_FORWARD_POLICY')
+
+    def _parse_logging(self, ufw_conf):
+        if 'LOGLEVEL=full' in ufw_conf:
+            return 'full'
+        elif 'LOGLEVEL=high' in ufw_conf:
+            return 'high'
+        elif 'LOGLEVEL=medium' in ufw_conf:
+            return 'medium'
+        elif 'LOGLEVEL=low' in ufw_conf:
+            return 'low'
+        else:
+            return 'off'
@@ -0,0 +1,276 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import os, time, socket, struct
+
+TCP_LISTEN = '0A'
+UDP_CLOSE  = '07' # Unconnected UDP socket
+NO_APP     = '-'
+
+# netlink sock_diag
+NETLINK_SOCK_DIAG   = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST       = 0x1
+NLM_F_DUMP          = 0x300
+NLMSG_ERROR         = 2
+NLMSG_DONE          = 3
+TCP_LISTEN_STATE    = 10
+TCP_CLOSE_STATE     = 7
+
+
+class Listener():
+    """A listening socket, as a row of the Listening Report"""
+    __slots__ = ['protocol', 'port', 'address', 'app', 'policy', 'partial']
+
+    def __init__(self, protocol, port, address, app, policy='', partial=''):
+        self.protocol = protocol # TCP | TCP6 | UDP | UDP6
+        self.port     = port
+        self.address  = address  # '*' = any
+        self.app      = app
+        self.policy   = policy   # First matching rule: allow | deny | reject | limit | ''
+        self.partial  = partial  # A rule before, just for an interface or some addresses: allow | deny | reject | limit | ''
+
+    def get_key(self):
+        return (self.protocol, self.port, self.address, self.app)
+
+    def __eq__(self, other):
+        return isinstance(other, Listener) and self.get_key() == other.get_key() and self.policy == other.policy and self.partial == other.partial
+
+    def __repr__(self):
+        return 'Listener(' + ', '.join([self.protocol, str(self.port), self.address, self.app, self.policy, self.partial]) + ')'
+
+
+class SocketCollector():
+    """Listening sockets from /proc/net. The socket inode > process cache is completed on demand:
+       just the new processes are scanned, unless a socket is still unknown"""
+    TABLES = [('TCP', 'tcp'), ('TCP6', 'tcp6'), ('UDP', 'udp'), ('UDP6', 'udp6')]
+
+    monitor = False # Polled by the Listening Report
+    
+    def __init__(self, proc='/proc'):
+        self.proc = proc
+        self.inodes = {}      # socket inode > process name
+        self.pids = {}        # scanned pid > process name
+        self.orphans = set()  # Inodes without process after a full scan (kernel sockets, exited...)
+        self.last_inodes = set()
+
+    def is_available(self):
+        return os.path.isfile(os.path.join(self.proc, 'net', 'tcp'))
+
+    def collect(self, matcher=None):
+        sockets = self._read_sockets()
+        inodes = set([inode for (protocol, port, address, inode) in sockets])
+        self.last_inodes = inodes
+        unknown = inodes - set(self.inodes) - self.orphans
+        if unknown:
+            self._scan(unknown)
+        # Closed sockets
+        self.inodes = dict([(inode, app) for (inode, app) in self.inodes.items() if inode in inodes])
+        self.orphans &= inodes
+
+        listeners = {}
+        for (protocol, port, address, inode) in sockets:
+            listener = Listener(protocol, port, address, self.inodes.get(inode, NO_APP))
+            if listener.get_key() not in listeners:
+                (listener.policy, listener.partial) = self._policy(listener, matcher)
+                listeners[listener.get_key()] = listener
+
+        order = dict([(protocol, i) for (i, (protocol, table)) in enumerate(self.TABLES)])
+        return sorted(listeners.values(), key=lambda listener: (order[listener.protocol], listener.port, listener.address, listener.app))
+
+    def _read_sockets(self):
+        sockets = []
+        for (protocol, table) in self.TABLES:
+            sockets.extend(self._read_table(protocol, table))
+        return sockets
+
+    def _read_table(self, protocol, table):
+        sockets = []
+        try:
+            with open(os.path.join(self.proc, 'net', table)) as f:
+                lines = f.readlines()[1:]
+        except Exception: # IPv6 disabled
+            return sockets
+
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            if protocol.startswith('TCP'):
+                if fields[3] != TCP_LISTEN:
+                    continue
+            elif fields[3] != UDP_CLOSE or not fields[2].endswith(':0000'):
+                continue
+            (address, port) = fields[1].split(':')
+            sockets.append((protocol, int(port, 16), self._address(address), fields[9]))
+        return sockets
+
+    def _address(self, hex_address):
+        # Every 32 bits word is printed in host order
+        raw = b''.join([struct.pack('=I', int(hex_address[i:i + 8], 16)) for i in range(0, len(hex_address), 8)])
+        if len(raw) == 4:
+            address = socket.inet_ntop(socket.AF_INET, raw)
+        else:
+            address = socket.inet_ntop(socket.AF_INET6, raw)
+        if address in ['0.0.0.0', '::']:
+            return '*'
+        return address
+
+    def _scan(self, unknown):
+        pids = set([pid for pid in os.listdir(self.proc) if pid.isdigit()])
+        for pid in set(self.pids) - pids: # Exited
+            del self.pids[pid]
+
+        # New processes first, the known ones just if there are still unknown sockets
+        new_pids = pids - set(self.pids)
+        for pid in new_pids:
+            self._scan_pid(pid, unknown)
+        if unknown:
+            for pid in pids - new_pids:
+                self._scan_pid(pid, unknown)
+                if not unknown:
+                    break
+        self.orphans |= unknown
+
+    def _scan_pid(self, pid, unknown):
+        fd_path = os.path.join(self.proc, pid, 'fd')
+        try:
+            fds = os.listdir(fd_path)
+        except Exception: # Exited or not allowed
+            return
+        if pid not in self.pids:
+            try:
+                with open(os.path.join(self.proc, pid, 'comm')) as f:
+                    self.pids[pid] = f.read().strip()
+            except Exception:
+                return
+
+        for fd in fds:
+            try:
+                link = os.readlink(os.path.join(fd_path, fd))
+            except Exception:
+                continue
+            if link.startswith('socket:['):
+                inode = link[len('socket:['):-1]
+                if inode not in self.inodes:
+                    self.inodes[inode] = self.pids[pid]
+                unknown.discard(inode)
+
+    def _policy(self, listener, matcher):
+        # The first incoming rule for this port and address, and the action of a rule before it
+        # just for an interface or some addresses (the port is partially allowed, denied...)
+        if matcher is None:
+            return ('', '')
+        address = None
+        if listener.address != '*':
+            address = listener.address
+        proto = listener.protocol.rstrip('6').lower()
+        v6 = listener.protocol.endswith('6')
+        (number, rule) = matcher.match('in', proto, address, listener.port, v6=v6)
+        policy = ''
+        if rule is not None:
+            policy = rule.action
+        for i in matcher.partial('in', proto, address, listener.port, v6=v6, before=number):
+            if matcher.rules[i].action != policy:
+                return (policy, matcher.rules[i].action)
+        return (policy, '')
+
+
+class NetlinkSocketCollector(SocketCollector):
+    """Listening sockets from a netlink sock_diag dump. A dump is cheap enough to watch for
+       changes: wait_change() dumps often after a change and backs off while nothing changes"""
+    DUMPS = [('TCP',  socket.AF_INET,  socket.IPPROTO_TCP, 1 << TCP_LISTEN_STATE),
+             ('TCP6', socket.AF_INET6, socket.IPPROTO_TCP, 1 << TCP_LISTEN_STATE),
+             ('UDP',  socket.AF_INET,  socket.IPPROTO_UDP, 1 << TCP_CLOSE_STATE),
+             ('UDP6', socket.AF_INET6, socket.IPPROTO_UDP, 1 << TCP_CLOSE_STATE)]
+    MIN_WAIT = 0.1 # Seconds between dumps after a change
+    MAX_WAIT = 2.0 # Seconds between dumps when stable
+    monitor = True
+
+    def __init__(self, proc='/proc'):
+        SocketCollector.__init__(self, proc)
+        self.seq = 0
+        self.wait = self.MIN_WAIT
+
+    def is_available(self):
+        try:
+            self._read_sockets()
+            return True
+        except Exception:
+            return False
+
+    def wait_change(self, timeout):
+        """Blocks until the listening sockets differ from the last collect() or timeout seconds"""
+        end = time.monotonic() + timeout
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.wait, remaining))
+            try:
+                inodes = set([inode for (protocol, port, address, inode) in self._read_sockets()])
+            except Exception:
+                return True # Let collect() fail
+            if inodes != self.last_inodes:
+                self.wait = self.MIN_WAIT
+                return True
+            self.wait = min(self.wait * 2, self.MAX_WAIT)
+
+    def _read_sockets(self):
+        sockets = []
+        nl = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG)
+        try:
+            for (protocol, family, ip_proto, states) in self.DUMPS:
+                sockets.extend(self._dump(nl, protocol, family, ip_proto, states))
+        finally:
+            nl.close()
+        return sockets
+
+    def _dump(self, nl, protocol, family, ip_proto, states):
+        # inet_diag_req_v2: family, protocol, ext, pad, states + an empty inet_diag_sockid
+        request = struct.pack('=BBBBI', family, ip_proto, 0, 0, states) + bytes(48)
+        self.seq += 1
+        nl.send(struct.pack('=IHHII', 16 + len(request), SOCK_DIAG_BY_FAMILY, NLM_F_REQUEST | NLM_F_DUMP, self.seq, 0) + request)
+
+        sockets = []
+        while True:
+            data = nl.recv(65536)
+            offset = 0
+            while offset + 16 <= len(data):
+                (length, msg_type, flags, seq, pid) = struct.unpack_from('=IHHII', data, offset)
+                if msg_type == NLMSG_DONE:
+                    return sockets
+                if msg_type == NLMSG_ERROR:
+                    (error,) = struct.unpack_from('=i', data, offset + 16)
+                    if error == 0: # ACK
+                        return sockets
+                    raise OSError(-error, os.strerror(-error))
+                # inet_diag_msg: family, state, timer, retrans, sockid (sport, dport, src, dst, if, cookie), expires, rqueue, wqueue, uid, inode
+                msg = offset + 16
+                (sport, dport) = struct.unpack_from('>HH', data, msg + 4)
+                (inode,) = struct.unpack_from('=I', data, msg + 68)
+                if protocol.startswith('TCP') or dport == 0: # UDP: unconnected
+                    if family == socket.AF_INET:
+                        address = socket.inet_ntop(family, data[msg + 8:msg + 12])
+                    else:
+                        address = socket.inet_ntop(family, data[msg + 8:msg + 24])
+                    if address in ['0.0.0.0', '::']:
+                        address = '*'
+                    sockets.append((protocol, sport, address, str(inode)))
+                offset += (length + 3) & ~3
+            if not data:
+                return sockets
@@ -15,88 +15,147 @@
 # along with Gufw; if not, see http://www.gnu.org/licenses for more
 # information.
 
-import time, os, shutil, subprocess, configparser
+import time, os, glob, shutil, subprocess, configparser, threading, atexit
+from gufw.model.backend    import FirewallBackend
+from gufw.model.ufw_engine import UfwEngine
+from gufw.model.snapshot   import FirewallSnapshot
+from gufw.model.user_rules import UserRules
+from gufw.model.rule       import Rule
+from gufw.model.sockets    import SocketCollector, NetlinkSocketCollector, Listener
+from gufw.model.matcher    import RuleMatcher
+from gufw.model.counters   import CounterCollector
+from gufw.model.address_lists import AddressLists
+from gufw.model.instrumentation import CommandStats
 
 
-class Backend():
+class Backend(FirewallBackend):
     UFW_PATH    = '/usr/sbin/ufw'
     UFW_DEFAULT = '/etc/default/ufw'
     UFW_CONF    = '/etc/ufw/ufw.conf'
     UFW_SYSCTL  = '/etc/ufw/sysctl.conf'
-    GUFW_PATH   = '/etc/gufw'
-    GUFW_CFG    = '/etc/gufw/gufw.cfg'
-    GUFW_LOG    = '/var/log/gufw.log'
+    UFW_USER    = '/etc/ufw/user.rules'
+    UFW_USER6   = '/etc/ufw/user6.rules'
     
     def __init__(self):
-        pass
+        self.snapshot = None
+        self.generation = 0 # Changes with every mutation
+        self.matcher = None # (snapshot, RuleMatcher)
+        self.engine_lock = threading.Lock() # ufw in-process from the listening report thread too
+        
+        # Time of every command. GUFW_COMMAND_STATS=file (or 1 for stderr) dumps them on exit
+        self.command_stats = CommandStats()
+        if os.environ.get('GUFW_COMMAND_STATS'):
+            atexit.register(self.command_stats.dump, os.environ['GUFW_COMMAND_STATS'])
+        
+        self.engine = self._new_engine()
+        
+        # Listening sockets from /proc/net. 'ListeningMonitor = netlink' in gufw.cfg watches them through netlink
+        self.sockets = SocketCollector()
+        if self.get_cfg_value('ListeningMonitor') == 'netlink':
+            sockets = NetlinkSocketCollector()
+            if sockets.is_available():
+                self.sockets = sockets
+        if not self.sockets.is_available(): # ufw show listening
+            self.sockets = None
+        
+        self.address_lists = AddressLists(os.path.join(self.GUFW_PATH, 'address_lists'))
+        
+        # Packets & bytes by rule. 'RuleCounters = yes' in gufw.cfg
+        self.counters = None
+        if self.get_cfg_value('RuleCounters') == 'yes':
+            counters = CounterCollector()
+            if counters.is_available():
+                self.counters = counters
+    
+    def _new_engine(self):
+        # ufw in-process (no new interpreter per command). 'UfwEngine = subprocess' in gufw.cfg disables it
+        if self.get_cfg_value('UfwEngine') != 'subprocess':
+            engine = UfwEngine()
+            if engine.available:
+                return engine
+        return None
     
     def _run_cmd(self, cmd, lang_c=False):
+        start = time.perf_counter()
+        (stdout, stderr) = self._exec_cmd(cmd, lang_c)
+        self.command_stats.record(cmd, time.perf_counter() - start, stderr)
+        return self._cmd_output(stdout, stderr)
+    
+    def _exec_cmd(self, cmd, lang_c):
+        if self.engine and cmd[0] == self.UFW_PATH:
+            try:
+                with self.engine_lock:
+                    return self.engine.run(cmd[1:])
+            except Exception: # Unexpected ufw version, before any change? > Fallback to the ufw command
+                pass
+        
         if lang_c:
             proc = subprocess.Popen(cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={'LANG':'C'})
         else:
             proc = subprocess.Popen(cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         stdout,stderr=proc.communicate()
         
-        if stderr and not stderr.decode().startswith("WARN") and not stderr.decode().startswith("DEBUG"): # Error
-            while stderr[-1:] == '\n':
-                stderr = stderr[:-1]
-            return stderr.decode('utf-8')
+        return (stdout.decode('utf-8'), stderr.decode('utf-8'))
+    
+    def _cmd_output(self, stdout, stderr):
+        if stderr and not stderr.startswith("WARN") and not stderr.startswith("DEBUG"): # Error
+            return stderr.rstrip('\n')
         else: # OK
-            while stdout[-1:] == '\n':
-                stdout = stdout[:-1]
-            return stdout.decode('utf-8')
+            return stdout.rstrip('\n')
+    
+    def _read_file(self, path):
+        try:
+            with open(path) as f:
+                return f.read()
+        except Exception:
+            return ''
+    
+    def get_snapshot(self):
+        # All the getters share this snapshot until a mutation invalidates it
+        snapshot = self.snapshot
+        if snapshot is None:
+            generation = self.generation
+            ufw_status = self._run_cmd([self.UFW_PATH, 'status', 'numbered'], True)
+            ufw_default = self._read_file(self.UFW_DEFAULT)
+            
+            # Disabled firewall: ufw doesn't list the rules > Read them from its files
+            user_rules = None
+            if 'Status: active' not in ufw_status:
+                user6 = ''
+                if 'IPV6=no' not in ufw_default.replace(' ', ''):
+                    user6 = self._read_file(self.UFW_USER6)
+                user_rules = UserRules().get_rules(self._read_file(self.UFW_USER), user6)
+            
+            snapshot = FirewallSnapshot(ufw_status,
+                                        ufw_default,
+                                        self._read_file(self.UFW_CONF),
+                                        self._read_file(self.UFW_SYSCTL),
+                                        user_rules)
+            if generation == self.generation: # Not outdated by a mutation from another thread
+                self.snapshot = snapshot
+        return snapshot
+    
+    def get_matcher(self):
+        # Compiled once per snapshot
+        snapshot = self.get_snapshot()
+        matcher = self.matcher
+        if matcher is None or matcher[0] is not snapshot:
+            matcher = (snapshot, RuleMatcher(snapshot.rules))
+            self.matcher = matcher
+        return matcher[1]
+    
+    def invalidate_snapshot(self):
+        self.generation += 1
+        self.snapshot = None
     
     def get_status(self):
-        if 'Status: active' in self._run_cmd([self.UFW_PATH, 'status'], True):
-            return True
-        else:
-            return False
+        return self.get_snapshot().status
     
     def get_policy(self, policy):
-        if policy == 'incoming':
-            ufw_default_incoming = self._run_cmd(['grep', 'DEFAULT_INPUT_POLICY', self.UFW_DEFAULT])
-            if 'ACCEPT' in ufw_default_incoming:
-                return 'allow'
-            elif 'DROP' in ufw_default_incoming:
-                return 'deny'
-            elif 'REJECT' in ufw_default_incoming:
-                return 'reject'
-        
-        elif policy == 'outgoing':
-            ufw_default_outgoing = self._run_cmd(['grep', 'DEFAULT_OUTPUT_POLICY', self.UFW_DEFAULT])
-            if 'ACCEPT' in ufw_default_outgoing:
-                return 'allow'
-            elif 'DROP' in ufw_default_outgoing:
-                return 'deny'
-            elif 'REJECT' in ufw_default_outgoing:
-                return 'reject'
-        
-        elif policy == 'routed':
-            ufw_default_outgoing = self._run_cmd(['grep', 'net/ipv4/ip_forward=', self.UFW_SYSCTL])
-            routed_status = ufw_default_outgoing.replace(" ", "")
-            if "#net/ipv4/ip_forward=1" in routed_status:
-                return 'disabled'
-            
-            ufw_default_outgoing = self._run_cmd(['grep', 'DEFAULT_FORWARD_POLICY', self.UFW_DEFAULT])
-            if 'ACCEPT' in ufw_default_outgoing:
-                return 'allow'
-            elif 'DROP' in ufw_default_outgoing:
-                return 'deny'
-            elif 'REJECT' in ufw_default_outgoing:
-                return 'reject'
+        return self.get_snapshot().policies.get(policy)
     
     def get_ufw_logging(self):
-        ufw_cmd = self._run_cmd(['cat', self.UFW_CONF])
-        if 'LOGLEVEL=full' in ufw_cmd:
-            return 'full'
-        elif 'LOGLEVEL=high' in ufw_cmd:
-            return 'high'
-        elif 'LOGLEVEL=medium' in ufw_cmd:
-            return 'medium'
-        elif 'LOGLEVEL=low' in ufw_cmd:
-            return 'low'
-        else:
-            return 'off'
+        return self.get_snapshot().logging
     
     def set_status(self, status):
         if not status:
@@ -105,6 +164,7 @@ class Backend():
             cmd = [self.UFW_PATH, '--force', 'enable']
         
         self._run_cmd(cmd)
+        self.invalidate_snapshot()
     
     def set_policy(self, policy, value):
         if policy == 'incoming':
@@ -133,6 +193,7 @@ class Backend():
         
         if cmd:
             self._run_cmd(cmd)
+            self.invalidate_snapshot()
     
     def set_ufw_logging(self, logging):
         if logging == 'off':
@@ -148,41 +209,12 @@ class Backend():
         
         if cmd:
             self._run_cmd(cmd)
+            self.invalidate_snapshot()
     
     def reset_fw(self):
         cmd = [self.UFW_PATH, '--force', 'reset']
         self._run_cmd(cmd, True)
-    
-    def get_cfg_value(self, attribute):
-        cfg = configparser.ConfigParser()
-        try:
-            if not cfg.read([self.GUFW_CFG]):
-                return ''
-        except Exception:
-            os.remove(self.GUFW_CFG)
-            return ''
-        
-        if not cfg.has_option('GufwConfiguration', attribute):
-            return ''
-            
-        return cfg.get('GufwConfiguration', attribute)
-    
-    def set_cfg_value(self, attr, value):
-        cfg_file = self.GUFW_CFG
-        if not os.path.isfile(cfg_file):
-            f = open(cfg_file, 'w')
-            cfg = configparser.ConfigParser()
-            cfg.add_section("GufwConfiguration")
-            cfg.write(f)  
-            f.close()  
-            os.chmod(cfg_file, 0o600) # Just an admin can read this file
-        
-        cfg = configparser.ConfigParser()
-        cfg.read(cfg_file)
-        cfg.set('GufwConfiguration', attr, str(value))
-        f = open(cfg_file, 'w')
-        cfg.write(f)  
-        f.close()
+        self.invalidate_snapshot()
     
     def set_profile_values(self, profile, status, incoming, outgoing, routed, rules):
         if not os.path.exists(self.GUFW_PATH):
@@ -204,23 +236,23 @@ class Backend():
         
         i = 0
         for rule in rules:
-            if not rule['command']:
+            if not rule.command:
                 continue
             section = 'Rule' + str(i)
             cfg.add_section(section)
-            cfg.set(section, 'ufw_rule',    rule['ufw_rule'])
-            cfg.set(section, 'description', rule['description'])
-            cfg.set(section, 'command',     rule['command'])
-            cfg.set(section, 'policy',      rule['policy'])
-            cfg.set(section, 'direction',   rule['direction']) 
-            cfg.set(section, 'protocol',    rule['protocol']) 
-            cfg.set(section, 'from_ip',     rule['from_ip']) 
-            cfg.set(section, 'from_port',   rule['from_port']) 
-            cfg.set(section, 'to_ip',       rule['to_ip']) 
-            cfg.set(section, 'to_port',     rule['to_port']) 
-            cfg.set(section, 'iface',       rule['iface']) 
-            cfg.set(section, 'routed',      rule['routed']) 
-            cfg.set(section, 'logging',     rule['logging'] )
+            cfg.set(section, 'ufw_rule',    rule.ufw_rule)
+            cfg.set(section, 'description', rule.description)
+            cfg.set(section, 'command',     rule.command)
+            cfg.set(section, 'policy',      rule.policy)
+            cfg.set(section, 'direction',   rule.direction) 
+            cfg.set(section, 'protocol',    rule.protocol) 
+            cfg.set(section, 'from_ip',     rule.from_ip) 
+            cfg.set(section, 'from_port',   rule.from_port) 
+            cfg.set(section, 'to_ip',       rule.to_ip) 
+            cfg.set(section, 'to_port',     rule.to_port) 
+            cfg.set(section, 'iface',       rule.iface) 
+            cfg.set(section, 'routed',      rule.routed) 
+            cfg.set(section, 'logging',     rule.logging )
             i += 1
         
         f = open(file_path, 'w')
@@ -239,7 +271,7 @@ class Backend():
             file_path = profile
         else:
             file_name = profile + '.profile'
-            file_path = os.path.join('/etc', 'gufw', file_name)
+            file_path = os.path.join(self.GUFW_PATH, file_name)
         
         cfg = configparser.ConfigParser()
         if not cfg.read([file_path]):
@@ -265,34 +297,43 @@ class Backend():
                 
             
             else:
-                rule = {'ufw_rule'   : cfg.get(section, 'ufw_rule'), 
-                        'description': cfg.get(section, 'description'),
-                        'command'    : cfg.get(section, 'command'),
-                        'policy'     : cfg.get(section, 'policy'),
-                        'direction'  : cfg.get(section, 'direction'),
-                        'protocol'   : cfg.get(section, 'protocol'),
-                        'from_ip'    : cfg.get(section, 'from_ip'),
-                        'from_port'  : cfg.get(section, 'from_port'),
-                        'to_ip'      : cfg.get(section, 'to_ip'),
-                        'to_port'    : cfg.get(section, 'to_port'),
-                        'iface'      : cfg.get(section, 'iface'),
-                        'logging'    : cfg.get(section, 'logging')}
+                rule = Rule(ufw_rule    = cfg.get(section, 'ufw_rule'),
+                            description = cfg.get(section, 'description'),
+                            command     = cfg.get(section, 'command'),
+                            policy      = cfg.get(section, 'policy'),
+                            direction   = cfg.get(section, 'direction'),
+                            protocol    = cfg.get(section, 'protocol'),
+                            from_ip     = cfg.get(section, 'from_ip'),
+                            from_port   = cfg.get(section, 'from_port'),
+                            to_ip       = cfg.get(section, 'to_ip'),
+                            to_port     = cfg.get(section, 'to_port'),
+                            iface       = cfg.get(section, 'iface'),
+                            logging     = cfg.get(section, 'logging'))
                 # Previous Gufw profiles
                 try:
-                    rule['routed'] = cfg.get(section, 'routed')
+                    rule.routed = cfg.get(section, 'routed')
                 except configparser.NoOptionError:
-                    rule['routed'] = ''
+                    rule.routed = ''
                 rules.append(rule)
         
         return (status, incoming, outgoing, routed, rules)
     
     
+    def get_profiles(self):
+        files = glob.glob(os.path.join(self.GUFW_PATH, '*.profile'))
+        files.sort(key=lambda x: os.path.getctime(x)) # Sort by time and date
+        return [os.path.splitext(os.path.basename(profile))[0] for profile in files] # Filename without path and extension
+    
+    def exists_profile(self, profile):
+        return os.path.isfile(os.path.join(self.GUFW_PATH, profile + '.profile'))
+    
     def delete_file_profile(self, profile):
         dst = os.path.join(self.GUFW_PATH, profile + '.profile')
         try:
             os.remove(dst)
         except Exception:
             pass
+        self.address_lists.delete_profile(profile)
     
     def rename_file_profile(self, old, new):
         src = os.path.join(self.GUFW_PATH, old + '.profile')
@@ -305,6 +346,7 @@ class Backend():
             os.rename(src, dst)
         except Exception:
             pass
+        self.address_lists.rename_profile(old, new)
     
     def export_profile(self, profile, dst):
         src = os.path.join(self.GUFW_PATH, profile + '.profile')
@@ -348,30 +390,28 @@ class Backend():
         return cmd
     
     def get_rules(self):
-        rules = self._run_cmd([self.UFW_PATH, 'status', 'numbered'], True)
-        lines = rules.split('\n')
-        return_rules = []
-        
-        for line in lines:
-            if line and 'ALLOW' in line or 'DENY' in line or 'LIMIT' in line or 'REJECT' in line:
-                rule = line.split('] ')
-                return_rules.append(' '.join(rule[1].split()))
-        
-        return return_rules
+        return list(self.get_snapshot().rules)
     
     def get_number_rules(self):
-        numb = 0
-        rules = self._run_cmd([self.UFW_PATH, 'status', 'numbered'], True)
-        lines = rules.split('\n')
-        return_rules = []
+        return len(self.get_snapshot().rules)
+    
+    def add_rule(self, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        cmd_rule = self._compose_rule_cmd(insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port)
         
-        for line in lines:
-            if line and 'ALLOW' in line or 'DENY' in line or 'LIMIT' in line or 'REJECT' in line:
-                numb = numb + 1
+        # Launch
+        cmd = self._run_cmd(cmd_rule, True)
+        self.invalidate_snapshot()
+        
+        result = []
+        result.append(' '.join(cmd_rule))
+        result.append(cmd)
         
-        return numb
+        return result # cmd | ufw result
     
-    def add_rule(self, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+    def get_rule_cmd(self, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
+        return ' '.join(self._compose_rule_cmd('', policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port))
+    
+    def _compose_rule_cmd(self, insert, policy, direction, iface, routed, logging, proto, from_ip, from_port, to_ip, to_port):
         # ufw [route] [insert NUM] allow|deny|reject|limit [in|out on INTERFACE] [log|log-all] [proto protocol] [from ADDRESS [port PORT]] [to ADDRESS [port PORT]]
         cmd_rule = [self.UFW_PATH]
         
@@ -438,18 +478,77 @@ class Backend():
                 to_port = to_port.replace('/udp', '')
             cmd_rule.extend(['port', to_port])
         
-        # Launch
-        cmd = self._run_cmd(cmd_rule, True)
-        
+        return cmd_rule
+    
+    def set_rules(self, rules):
+        """Set the whole ufw ruleset in one go. rules is the final list in order: a number keeps
+           that current ufw rule, a profile Rule is added. Returns the [cmd, result] list"""
+        if self.engine:
+            entries = []
+            for rule in rules:
+                if isinstance(rule, int):
+                    entries.append(rule)
+                else:
+                    cmd_rule = self._compose_rule_cmd('', rule.policy, rule.direction, rule.iface, rule.routed, rule.logging, rule.protocol, rule.from_ip, rule.from_port, rule.to_ip, rule.to_port)
+                    entries.append((cmd_rule[1:], self._rule_family(rule)))
+            try:
+                start = time.perf_counter()
+                with self.engine_lock:
+                    (stdout, stderr) = self.engine.apply_rules(entries)
+                self.command_stats.record([self.UFW_PATH, 'reload'], time.perf_counter() - start, stderr)
+                self.invalidate_snapshot()
+                return [[self.UFW_PATH + ' reload', self._cmd_output(stdout, stderr)]]
+            except Exception: # Unexpected ufw version, nothing written? > One by one
+                self.invalidate_snapshot()
+        
+        return self._set_rules_one_by_one(rules)
+    
+    def can_reorder(self):
+        # One by one, the kept rules can't change their order
+        return self.engine is not None
+    
+    def _rule_family(self, rule):
+        # A profile stores the IPv4 and IPv6 ufw rules of the same command. Rule.v6, parsed once
+        if not rule.ufw_rule:
+            return ''
+        if rule.v6:
+            return 'v6'
+        return 'v4'
+    
+    def _set_rules_one_by_one(self, rules):
         result = []
-        result.append(' '.join(cmd_rule))
-        result.append(cmd)
+        keep = set([rule for rule in rules if isinstance(rule, int)])
+        current = self.get_rules()
+        kept = dict([(num, current[num - 1]) for num in keep if num <= len(current)])
+        
+        for num in reversed(range(1, len(current) + 1)):
+            if num not in keep:
+                result.append(self.delete_rule(num))
+        
+        # Insert before the next kept rule of its family, at its live number: ufw could add 2 rules
+        # (IPv4 & IPv6) or skip a duplicated one. Append if no kept rule follows
+        kept_rules = set([rule.ufw_rule for rule in kept.values()])
+        for i, rule in enumerate(rules):
+            if isinstance(rule, int):
+                continue
+            family = self._rule_family(rule) or 'v4'
+            live = [live_rule.ufw_rule for live_rule in self.get_rules()]
+            if family == 'v6' and rule.ufw_rule in live and rule.ufw_rule not in kept_rules:
+                # Added with its IPv4 rule, where ufw puts it: again at its place
+                result.append(self.delete_rule(live.index(rule.ufw_rule) + 1))
+                live = [live_rule.ufw_rule for live_rule in self.get_rules()]
+            following = [kept[num].ufw_rule for num in rules[i + 1:] if isinstance(num, int) and num in kept and self._rule_family(kept[num]) == family]
+            insert = ''
+            if following and following[0] in live:
+                insert = str(live.index(following[0]) + 1)
+            result.append(self.add_rule(insert, rule.policy, rule.direction, rule.iface, rule.routed, rule.logging, rule.protocol, rule.from_ip, rule.from_port, rule.to_ip, rule.to_port))
         
-        return result # cmd | ufw result
+        return result
     
     def delete_rule(self, num):
         delete_rule = [self.UFW_PATH, '--force', 'delete', str(num)]
         cmd = self._run_cmd(delete_rule)
+        self.invalidate_snapshot()
         
         result = []
         result.append(' '.join(delete_rule))
@@ -479,7 +578,73 @@ class Backend():
         else:
             return '127.0.0.1'
     
+    def get_command_stats(self):
+        return self.command_stats.get_stats()
+    
     def get_listening_report(self):
+        if self.sockets:
+            return self.sockets.collect(self.get_matcher())
+        return self._get_ufw_listening_report()
+    
+    def get_listening_monitor(self):
+        return self.sockets is not None and self.sockets.monitor
+    
+    def get_address_lists(self, profile):
+        return self.address_lists.get_lists(profile)
+    
+    def get_addresses(self, profile, name):
+        return self.address_lists.get_addresses(profile, name)
+    
+    def add_address_list(self, profile, name, policy, direction):
+        (error, changed) = self.address_lists.add_list(profile, name, policy, direction)
+        if changed: # New hook
+            self._reload()
+        return error
+    
+    def delete_address_list(self, profile, name):
+        (error, changed) = self.address_lists.delete_list(profile, name)
+        if changed:
+            self._reload()
+        self.address_lists.destroy_sets(name)
+        return error
+    
+    def add_addresses(self, profile, name, addresses):
+        return self.address_lists.add_addresses(profile, name, addresses)
+    
+    def delete_addresses(self, profile, name, addresses):
+        return self.address_lists.delete_addresses(profile, name, addresses)
+    
+    def import_address_list(self, profile, name, list_file, policy, direction):
+        (error, changed, stats) = self.address_lists.import_file(profile, name, list_file, policy, direction)
+        if changed: # New list
+            self._reload()
+        return (error, stats)
+    
+    def apply_address_lists(self, profile):
+        (error, changed) = self.address_lists.apply(profile)
+        if changed:
+            self._reload()
+        if not error:
+            self.address_lists.destroy_other_sets(profile)
+        return error
+    
+    def _reload(self):
+        self._run_cmd([self.UFW_PATH, 'reload'])
+        self.invalidate_snapshot()
+    
+    def get_rule_counters(self):
+        # None if disabled
+        if self.counters is None:
+            return None
+        user6 = ''
+        if 'IPV6=no' not in self._read_file(self.UFW_DEFAULT).replace(' ', ''):
+            user6 = self._read_file(self.UFW_USER6)
+        return self.counters.sample(self._read_file(self.UFW_USER), user6)
+    
+    def wait_listening_change(self, timeout):
+        return self.sockets.wait_change(timeout)
+    
+    def _get_ufw_listening_report(self):
         return_report = []
         actual_protocol = 'None'
         ufw_report = self._run_cmd([self.UFW_PATH, 'show', 'listening'], True)
@@ -503,7 +668,7 @@ class Backend():
                 actual_protocol = 'UDP'
                 continue
             
-            policy = 'None'
+            policy = ''
             descomponent_report = descomponent_report.strip()
             descomponent_report = descomponent_report.replace('(', '')
             descomponent_report = descomponent_report.replace(')', '')
@@ -521,7 +686,6 @@ class Backend():
             
             descomponent_report = descomponent_report.split('%')
             descomponent_fields = descomponent_report[0].split(' ')
-            # Order: protocol % port % address % application % policy
-            return_report.append('%'.join([actual_protocol, descomponent_fields[0], descomponent_fields[1], descomponent_fields[2], policy]))
+            return_report.append(Listener(actual_protocol, int(descomponent_fields[0]), descomponent_fields[1], descomponent_fields[2], policy))
         
         return return_report
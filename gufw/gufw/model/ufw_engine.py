@@ -0,0 +1,183 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import io, gettext, contextlib
+
+
+class UfwEngine():
+    """Run ufw commands with ufw's own Python modules, without a new process"""
+    APP_ACTIONS = ['app-list', 'app-info', 'app-default', 'app-update']
+
+    def __init__(self):
+        self.available = False
+        try:
+            import ufw.common, ufw.frontend, ufw.util
+        except Exception:
+            return
+
+        self.common   = ufw.common
+        self.frontend = ufw.frontend
+        self.util     = ufw.util
+        # ufw modules use a builtin _(). Untranslated, like running /usr/sbin/ufw with LANG=C
+        gettext.NullTranslations().install()
+        self.available = True
+
+    def run(self, args):
+        """args without the ufw path. Returns (stdout, stderr) as /usr/sbin/ufw would print them.
+           Raises only if ufw failed before changing anything"""
+        stdout = ''
+        stderr = io.StringIO()
+        lock = None
+
+        with contextlib.redirect_stderr(stderr):
+            started = False
+            try:
+                pr = self.frontend.parse_command(['ufw'] + list(args))
+                rule = pr.data.get('rule', '')
+                ip_type = pr.data.get('iptype', '')
+
+                if hasattr(self.util, 'create_lock'):
+                    lock = self.util.create_lock(dryrun=pr.dryrun)
+                ui = self.frontend.UFWFrontend(pr.dryrun)
+
+                started = True # ufw could write its files from here
+                if pr.action in self.APP_ACTIONS:
+                    stdout = ui.do_application_action(pr.action, pr.data['name'])
+                elif pr.action == 'reset':
+                    stdout = ui.reset(pr.force)
+                else:
+                    stdout = ui.do_action(pr.action, rule, ip_type, pr.force)
+            except self.common.UFWError as e:
+                stderr.write('ERROR: ' + e.value + '\n')
+            except SystemExit: # ufw.util.error() already wrote to stderr
+                pass
+            except Exception as e:
+                if not started:
+                    raise # Unexpected ufw version? Nothing changed yet: the caller runs the ufw command
+                stderr.write('ERROR: ' + str(e) + '\n') # Running it again could apply it twice
+            finally:
+                if lock is not None:
+                    self.util.release_lock(lock)
+
+        return (stdout or '', stderr.getvalue())
+
+    def apply_rules(self, entries):
+        """entries is the final ruleset in order: a number keeps that current rule, (args, family)
+           adds a new one. Writes user.rules and user6.rules once and reloads once. If the
+           write or the reload fails, the previous files are restored"""
+        stdout = ''
+        stderr = io.StringIO()
+        lock = None
+
+        with contextlib.redirect_stderr(stderr):
+            started = False
+            try:
+                if hasattr(self.util, 'create_lock'):
+                    lock = self.util.create_lock()
+                ui = self.frontend.UFWFrontend(False)
+                backend = ui.backend
+                numbered = self._get_numbered_rules(backend.get_rules())
+
+                rules = []
+                rules6 = []
+                added = {}
+                for entry in entries:
+                    if isinstance(entry, int):
+                        new_rules = [rule.dup_rule() for rule in numbered[entry - 1]]
+                    else:
+                        (args, family) = entry
+                        pr = self.frontend.parse_command(['ufw'] + list(args))
+                        new_rules = self._split_rule(pr.data['rule'], pr.data['iptype'], family, backend.use_ipv6())
+
+                    for rule in new_rules:
+                        key = self._rule_key(rule)
+                        if key in added: # ufw skips existing rules too
+                            continue
+                        added[key] = True
+                        if rule.v6:
+                            rules6.append(rule)
+                        else:
+                            rules.append(rule)
+
+                previous = {}
+                for key in ['rules', 'rules6']:
+                    with open(backend.files[key]) as f:
+                        previous[key] = f.read()
+
+                started = True # Rules files written from here: on any error, back to the previous ones
+                try:
+                    backend.rules = rules
+                    backend.rules6 = rules6
+                    backend._write_rules(False)
+                    backend._write_rules(True)
+                    stdout = ui.do_action('reload', '', '', True)
+                except (Exception, SystemExit):
+                    for key in ['rules', 'rules6']:
+                        with open(backend.files[key], 'w') as f:
+                            f.write(previous[key])
+                    ui = self.frontend.UFWFrontend(False)
+                    ui.do_action('reload', '', '', True)
+                    raise
+            except self.common.UFWError as e:
+                stderr.write('ERROR: ' + e.value + '\n')
+            except SystemExit:
+                pass
+            except Exception as e:
+                if not started:
+                    raise # Unexpected ufw version? Nothing written yet: the caller adds the rules one by one
+                stderr.write('ERROR: ' + str(e) + '\n')
+            finally:
+                if lock is not None:
+                    self.util.release_lock(lock)
+
+        return (stdout or '', stderr.getvalue())
+
+    def _get_numbered_rules(self, rules):
+        # [[tuple]] by 'ufw status numbered' number. As UFWFrontend.get_rule_by_number(): all the
+        # tuples of an application rule (Samba tcp & udp...) are a single number
+        numbered = []
+        app_rules = {}
+        for rule in rules:
+            if rule.dapp != '' or rule.sapp != '':
+                app_tuple = rule.get_app_tuple()
+                if app_tuple in app_rules:
+                    app_rules[app_tuple].append(rule)
+                    continue
+                app_rules[app_tuple] = [rule]
+                numbered.append(app_rules[app_tuple])
+            else:
+                numbered.append([rule])
+        return numbered
+
+    def _split_rule(self, rule, ip_type, family, use_ipv6):
+        # Same IPv4/IPv6 split as UFWFrontend.set_rule()
+        new_rules = []
+        if ip_type == 'v4' or (ip_type == 'both' and family != 'v6'):
+            new_rules.append(rule.dup_rule())
+            new_rules[-1].set_v6(False)
+        if use_ipv6 and (ip_type == 'v6' or (ip_type == 'both' and family != 'v4')):
+            new_rules.append(rule.dup_rule())
+            new_rules[-1].set_v6(True)
+
+        for new_rule in new_rules:
+            new_rule.normalize()
+        return new_rules
+
+    def _rule_key(self, rule):
+        return (rule.v6, rule.action, rule.logtype, rule.direction, getattr(rule, 'forward', False),
+                rule.protocol, rule.src, rule.sport, rule.dst, rule.dport, rule.sapp, rule.dapp,
+                rule.interface_in, getattr(rule, 'interface_out', ''))
@@ -0,0 +1,198 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+ANYWHERE = ['0.0.0.0/0', '::/0']
+
+
+class UserRules():
+    """Rules from /etc/ufw/user.rules & user6.rules ('### tuple ###' lines), as 'ufw status numbered' shows them"""
+    TUPLE = '### tuple ###'
+
+    def get_rules(self, user_rules, user6_rules=''):
+        rules = []
+        for (text, v6) in [(user_rules, False), (user6_rules, True)]:
+            shown_apps = {}
+            for line in text.split('\n'):
+                if not line.startswith(self.TUPLE):
+                    continue
+                rule = self.parse_tuple(line, v6)
+                if not rule:
+                    continue
+                # ufw shows the ports of an application just once
+                if rule['dapp'] or rule['sapp']:
+                    app = self._app_key(rule)
+                    if app in shown_apps:
+                        continue
+                    shown_apps[app] = True
+                rules.append(self.format_rule(rule))
+        return rules
+    
+    def get_chain_rules(self, user_rules, user6_rules=''):
+        """{(v6, chain): [rule number of every '-A' entry, 0 = not a verdict (log, recent --set)]}
+           The rules numbered as get_rules() does, for the iptables counters of these chains"""
+        chains = {}
+        number = 0
+        for (text, v6) in [(user_rules, False), (user6_rules, True)]:
+            shown_apps = {}
+            current = 0
+            for line in text.split('\n'):
+                if line.startswith(self.TUPLE):
+                    rule = self.parse_tuple(line, v6)
+                    current = 0
+                    if not rule:
+                        continue
+                    if rule['dapp'] or rule['sapp']: # Every tuple of an application is the same rule
+                        app = self._app_key(rule)
+                        if app not in shown_apps:
+                            number += 1
+                            shown_apps[app] = number
+                        current = shown_apps[app]
+                    else:
+                        number += 1
+                        current = number
+                elif line.startswith('### '): # END RULES, logging...
+                    current = 0
+                elif line.startswith('-A ') and current:
+                    fields = line.split()
+                    target = ''
+                    if '-j' in fields:
+                        target = fields[fields.index('-j') + 1]
+                    counted = current
+                    if not target or target == 'LOG' or target.startswith('ufw-user-logging-'):
+                        counted = 0
+                    chains.setdefault((v6, fields[1]), []).append(counted)
+        return chains
+    
+    def _app_key(self, rule):
+        return (rule['dapp'], rule['dst'], rule['sapp'], rule['src'], rule['direction'], rule['iface_in'], rule['iface_out'], rule['forward'])
+
+    def parse_tuple(self, line, v6=False):
+        # action[_log] proto dport dst sport src [dapp sapp] direction[_iface][!out_iface] [comment=hex]
+        fields = line[len(self.TUPLE):].split()
+        comment = ''
+        if fields and fields[-1].startswith('comment='):
+            comment = self._decode_comment(fields.pop()[len('comment='):])
+        if len(fields) == 7:
+            fields = fields[:6] + ['-', '-'] + fields[6:]
+        if len(fields) != 9:
+            return None
+
+        rule = {'action'   : fields[0],
+                'logtype'  : '',
+                'forward'  : False,
+                'protocol' : fields[1],
+                'dport'    : fields[2],
+                'dst'      : fields[3],
+                'sport'    : fields[4],
+                'src'      : fields[5],
+                'dapp'     : '',
+                'sapp'     : '',
+                'direction': 'in',
+                'iface_in' : '',
+                'iface_out': '',
+                'v6'       : v6,
+                'comment'  : comment}
+
+        if rule['action'].startswith('route:'):
+            rule['forward'] = True
+            rule['action'] = rule['action'][len('route:'):]
+        if '_' in rule['action']:
+            (rule['action'], rule['logtype']) = rule['action'].split('_', 1)
+        if fields[6] != '-':
+            rule['dapp'] = fields[6].replace('%20', ' ')
+        if fields[7] != '-':
+            rule['sapp'] = fields[7].replace('%20', ' ')
+
+        for i, part in enumerate(fields[8].split('!')):
+            if '_' in part:
+                (direction, iface) = part.split('_', 1)
+            else:
+                (direction, iface) = (part, '')
+            if i == 0:
+                rule['direction'] = direction
+            if direction == 'in':
+                rule['iface_in'] = iface
+            else:
+                rule['iface_out'] = iface
+
+        return rule
+
+    def _decode_comment(self, comment):
+        try:
+            return bytes.fromhex(comment).decode('utf-8', 'replace')
+        except ValueError:
+            return comment
+
+    def format_rule(self, rule):
+        """Same text as a 'ufw status numbered' line, without the number and extra spaces"""
+        dst = self._location(rule, rule['dst'], rule['dport'], rule['dapp'])
+        src = self._location(rule, rule['src'], rule['sport'], rule['sapp'])
+
+        if rule['forward']:
+            if rule['iface_out']:
+                dst += ' on ' + rule['iface_out']
+            if rule['iface_in']:
+                src += ' on ' + rule['iface_in']
+            action = rule['action'].upper() + ' FWD'
+        else:
+            if rule['iface_in']:
+                dst += ' on ' + rule['iface_in']
+            if rule['iface_out']:
+                src += ' on ' + rule['iface_out']
+            action = rule['action'].upper() + ' ' + rule['direction'].upper()
+
+        attribs = []
+        if rule['logtype']:
+            attribs.append(rule['logtype'])
+        if rule['direction'] == 'out' and not rule['forward']:
+            attribs.append('out')
+
+        line = ' '.join([dst, action, src])
+        if attribs:
+            line += ' (' + ', '.join(attribs) + ')'
+        if rule['comment']:
+            line += ' # ' + rule['comment']
+        return ' '.join(line.split())
+
+    def _location(self, rule, address, port, app):
+        show_proto = not rule['dapp'] and not rule['sapp']
+        if app:
+            port = app
+
+        location = ''
+        if address not in ANYWHERE:
+            location = address
+
+        if port != 'any':
+            if location:
+                location += ' ' + port
+            else:
+                location = port
+            if show_proto and rule['protocol'] != 'any':
+                location += '/' + rule['protocol']
+            if address == '::/0':
+                location += ' (v6)'
+        else:
+            if address in ANYWHERE:
+                location = 'Anywhere'
+            # Protocol without ports
+            if show_proto and rule['protocol'] != 'any' and rule['dport'] == rule['sport']:
+                location += '/' + rule['protocol']
+            if address == '::/0':
+                location += ' (v6)'
+
+        return location
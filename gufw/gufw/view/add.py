@@ -389,7 +389,7 @@ class Add:
         elif self.tabs.get_current_page() == 2:
             self._add_rule_advanced()
     
-    def _add(self, profile='', name='', policy='', direction='', proto='', from_ip='', from_port='', to_ip='', to_port='', insert='', iface='', routed='', logging=''):
+    def _add(self, profile='', name='', policy='', direction='', proto='', from_ip='', from_port='', to_ip='', to_port='', insert='', iface='', routed='', logging='', simulation=''):
         flag_OK = True
         flag_Warning = False
         
@@ -413,7 +413,7 @@ class Add:
         
         # OK
         if flag_OK and flag_Warning:
-            self.gufw.set_statusbar_msg(_("Rule(s) added"))
+            self.gufw.set_statusbar_msg(_("Rule(s) added") + simulation)
         # Some OK, some KO
         elif flag_OK and not flag_Warning:
             self.gufw.set_statusbar_msg(_("Warning: Some rules added. Review the log"))
@@ -478,6 +478,15 @@ class Add:
         to_ip = self.advanced_to_ip.get_text()
         to_port = self.advanced_to_port.get_text()
         
+        # Simulate against the rules before the new one
+        ignore = ()
+        if insert:
+            ignore = range(int(insert), self.gufw.frontend.get_number_rules() + 1)
+        simulation = self.gufw.simulate_rule(self.win_add, self.gufw.NUM2POLICY[self.advanced_policy.get_active()], self.gufw.NUM2DIRECTION[self.advanced_direction.get_active()], iface, routed, self.gufw.NUM2PROTO[self.advanced_protocol.get_active()], from_ip, from_port, to_ip, to_port, ignore)
+        if simulation is None:
+            self.gufw.set_statusbar_msg(_("Operation cancelled"))
+            return
+        
         self._add(self.gufw.frontend.get_profile(),                                   # profile
                  self.advanced_rule_name.get_text(),                            # name
                  self.gufw.NUM2POLICY[self.advanced_policy.get_active()],       # policy
@@ -490,7 +499,8 @@ class Add:
                  insert,                                                        # insert number
                  iface,                                                         # interface
                  routed,                                                        # routed
-                 self.gufw.NUM2LOGGING[self.advanced_log.get_active()])         # logging        
+                 self.gufw.NUM2LOGGING[self.advanced_log.get_active()],         # logging
+                 simulation)                                                    # what the traffic got before
         self.gufw.print_rules(self.gufw.frontend.get_rules())
 
 
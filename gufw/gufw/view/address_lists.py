@@ -0,0 +1,174 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+
+import gettext
+from gettext import gettext as _
+gettext.textdomain('gufw')
+
+NUM2POLICY    = {0: 'allow', 1: 'deny', 2: 'reject'}
+NUM2DIRECTION = {0: 'in', 1: 'out'}
+
+
+class AddressLists:
+    def __init__(self, gufw):
+        self.gufw = gufw
+
+        self.builder = Gtk.Builder()
+        self.builder.set_translation_domain('gufw')
+        self.builder.add_from_file('/usr/share/gufw/ui/address_lists.ui')
+
+        self._set_objects_name()
+        self._set_initial_values()
+
+        self.win_lists.set_transient_for(gufw.winMain)
+        self.builder.connect_signals(self)
+        self.win_lists.show_all()
+
+    def _set_objects_name(self):
+        self.win_lists       = self.builder.get_object('address_lists')
+        self.tv_lists        = self.builder.get_object('lists')
+        self.tv_addresses    = self.builder.get_object('addresses')
+        self.list_name       = self.builder.get_object('list_name')
+        self.list_policy     = self.builder.get_object('list_policy')
+        self.list_direction  = self.builder.get_object('list_direction')
+        self.address         = self.builder.get_object('address')
+
+    def _set_initial_values(self):
+        self.lists_model = Gtk.ListStore(str, # 0 name
+                                         str, # 1 policy
+                                         str, # 2 direction
+                                         str) # 3 color
+        self.tv_lists.set_model(self.lists_model)
+        render_txt = Gtk.CellRendererText()
+        for (title, column) in [(_("Name"), 0), (_("Action"), 1), (_("Direction"), 2)]:
+            tree_header = Gtk.TreeViewColumn(title, render_txt, text=column, foreground=3)
+            tree_header.set_resizable(True)
+            tree_header.set_sort_column_id(column)
+            self.tv_lists.append_column(tree_header)
+
+        self.addresses_model = Gtk.ListStore(str)
+        self.tv_addresses.set_model(self.addresses_model)
+        self.tv_addresses.get_selection().set_mode(Gtk.SelectionMode.MULTIPLE)
+        tree_header = Gtk.TreeViewColumn(_("Address"), Gtk.CellRendererText(), text=0)
+        tree_header.set_sort_column_id(0)
+        self.tv_addresses.append_column(tree_header)
+
+        self._print_lists()
+
+    def _print_lists(self):
+        self.lists_model.clear()
+        for (name, policy, direction) in self.gufw.frontend.get_address_lists():
+            self.lists_model.append([name, policy, direction, self.gufw.POLICY2COLOR.get(policy, self.gufw.POLICY2COLOR['others'])])
+        self.addresses_model.clear()
+
+    def _print_addresses(self):
+        self.addresses_model.clear()
+        name = self._get_selected_list()
+        if name:
+            for address in self.gufw.frontend.get_addresses(name):
+                self.addresses_model.append([address])
+
+    def _get_selected_list(self):
+        (model, iter_row) = self.tv_lists.get_selection().get_selected()
+        if iter_row is None:
+            return ''
+        return model.get_value(iter_row, 0)
+
+    def on_lists_selection_changed(self, widget, data=None):
+        self._print_addresses()
+
+    def on_btnAddList_clicked(self, widget, data=None):
+        name = self.list_name.get_text().strip()
+        policy = NUM2POLICY[self.list_policy.get_active()]
+        direction = NUM2DIRECTION[self.list_direction.get_active()]
+        error = self.gufw.frontend.add_address_list(name, policy, direction)
+        if error:
+            self.gufw.show_dialog(self.win_lists, _("Address list not valid"), error)
+            return
+        self.gufw.add_to_log(_("Address list added: ") + name + ' (' + policy + ' ' + direction + ')')
+        self.list_name.set_text('')
+        self._print_lists()
+
+    def on_btnDeleteList_clicked(self, widget, data=None):
+        name = self._get_selected_list()
+        if not name:
+            self.gufw.show_dialog(self.win_lists, _("No list selected"), _("You have to select a list"))
+            return
+        error = self.gufw.frontend.delete_address_list(name)
+        if error:
+            # Translators: Error running an ufw command
+            self.gufw.add_to_log(_("Error running: ") + error)
+        self.gufw.add_to_log(_("Address list removed: ") + name)
+        self._print_lists()
+
+    def on_btnImportList_clicked(self, widget, data=None):
+        # Into the new list name or the selected list
+        name = self.list_name.get_text().strip() or self._get_selected_list()
+        if not name:
+            self.gufw.show_dialog(self.win_lists, _("No list selected"), _("Select a list or type the name of a new list"))
+            return
+        list_file = self.gufw._file_dialog('open', _("Import Blocklist"))
+        if not list_file:
+            self.gufw.set_statusbar_msg(_("Import cancelled"))
+            return
+        policy = NUM2POLICY[self.list_policy.get_active()]
+        direction = NUM2DIRECTION[self.list_direction.get_active()]
+        (error, (valid, invalid, stored)) = self.gufw.frontend.import_address_list(list_file, name, policy, direction)
+        if error:
+            self.gufw.show_dialog(self.win_lists, _("Error"), error)
+        self.gufw.add_to_log(_("Blocklist imported: ") + list_file + ' > ' + name + ' (' + str(valid) + ' ' + _("valid") + ', ' + str(invalid) + ' ' + _("invalid") + ', ' + str(stored) + ' ' + _("networks") + ')')
+        self.list_name.set_text('')
+        self._print_lists()
+
+    def on_btnAddAddress_clicked(self, widget, data=None):
+        name = self._get_selected_list()
+        if not name:
+            self.gufw.show_dialog(self.win_lists, _("No list selected"), _("You have to select a list"))
+            return
+        (error, added, invalid) = self.gufw.frontend.add_addresses(name, self.address.get_text().replace(',', ' ').split())
+        if error:
+            self.gufw.show_dialog(self.win_lists, _("Error"), error)
+        elif invalid:
+            self.gufw.show_dialog(self.win_lists, _("Error: Insert a valid IP"), ' '.join(invalid))
+        for network in added:
+            self.gufw.add_to_log(_("Address added to ") + name + ': ' + network)
+        self.address.set_text('')
+        self._print_addresses()
+
+    def on_btnDeleteAddress_clicked(self, widget, data=None):
+        name = self._get_selected_list()
+        (model, rows) = self.tv_addresses.get_selection().get_selected_rows()
+        addresses = [model.get_value(model.get_iter(row), 0) for row in rows]
+        if not name or not addresses:
+            self.gufw.show_dialog(self.win_lists, _("No address selected"), _("You have to select an address"))
+            return
+        error = self.gufw.frontend.delete_addresses(name, addresses)
+        if error:
+            self.gufw.show_dialog(self.win_lists, _("Error"), error)
+        else:
+            self.gufw.add_to_log(_("Addresses removed from ") + name + ': ' + ' '.join(addresses))
+        self._print_addresses()
+
+    def on_close_btn_clicked(self, widget, data=None):
+        self.win_lists.destroy()
+
+    def on_address_lists_delete_event(self, widget, data=None):
+        self.win_lists.destroy()
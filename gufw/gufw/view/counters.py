@@ -0,0 +1,120 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import gi
+import threading
+gi.require_version('Gtk', '3.0')
+from gi.repository import GLib, Gtk
+
+import gettext
+from gettext import gettext as _
+gettext.textdomain('gufw')
+
+
+REFRESH_TIME = 3 # Default interval refresh
+
+# Columns in rules_model
+PACKETS = 16
+BYTES   = 17
+RATE    = 18
+
+
+class RuleCounters():
+    """Packets, bytes and rate columns of the rules, sampled while the rules are shown"""
+    def __init__(self, gufw):
+        self.gufw = gufw
+        self.enabled = self.gufw.frontend.get_config_value('RuleCounters') == 'yes'
+        self.running = True
+        self.collecting = False
+        self.counters = {} # Last sample
+
+        if self.gufw.frontend.get_config_value('RefreshInterval'):
+            self.refresh_time = int(self.gufw.frontend.get_config_value('RefreshInterval'))
+        else:
+            self.refresh_time = REFRESH_TIME
+
+        if not self.enabled:
+            return
+
+        render_txt = Gtk.CellRendererText()
+        for (title, column) in [(_("Packets"), PACKETS), (_("Bytes"), BYTES), (_("Rate"), RATE)]:
+            tree_header = Gtk.TreeViewColumn(title, render_txt, foreground=13)
+            tree_header.set_cell_data_func(render_txt, self._format_cell, column)
+            tree_header.set_resizable(True)
+            tree_header.set_sort_column_id(column)
+            tree_header.set_sizing(1)
+            self.gufw.tv_rules.append_column(tree_header)
+
+        self.gufw.stack.connect('notify::visible-child-name', self._on_visibility_changed)
+        GLib.timeout_add_seconds(self.refresh_time, self._on_timer)
+
+    def stopping(self):
+        self.running = False
+
+    def refresh(self):
+        if not self.enabled or not self.running or self.collecting:
+            return
+        if self.gufw.stack.get_visible_child_name() != 'rules': # Hidden: until it's shown again
+            return
+        self.collecting = True
+        threading.Thread(target=self._collect, daemon=True).start()
+
+    def show(self):
+        """Last sample into the rules rows"""
+        if not self.enabled:
+            return
+        model = self.gufw.rules_model
+        iter_row = model.get_iter_first()
+        while iter_row is not None:
+            (packets, size, rate) = self.counters.get(model.get_value(iter_row, 14), (0, 0, 0.0))
+            if model.get_value(iter_row, PACKETS) != packets:
+                model.set(iter_row, [PACKETS, BYTES], [packets, size])
+            if model.get_value(iter_row, RATE) != rate:
+                model.set_value(iter_row, RATE, rate)
+            iter_row = model.iter_next(iter_row)
+
+    def _on_timer(self):
+        self.refresh()
+        return self.running
+
+    def _on_visibility_changed(self, *args):
+        self.refresh()
+
+    def _collect(self):
+        # Worker thread: GTK only from the main loop
+        counters = None
+        try:
+            counters = self.gufw.frontend.get_rule_counters()
+        finally:
+            GLib.idle_add(self._collected, counters)
+
+    def _collected(self, counters):
+        self.collecting = False
+        if self.running and counters is not None:
+            self.counters = counters
+            self.show()
+        return False
+
+    def _format_cell(self, column, cell, model, iter_row, data):
+        value = model.get_value(iter_row, data)
+        if data == BYTES:
+            cell.set_property('text', GLib.format_size(int(value)))
+        elif data == RATE:
+            # Translators: Packets per second
+            cell.set_property('text', _("%.1f/s") % value)
+        else:
+            cell.set_property('text', str(int(value)))
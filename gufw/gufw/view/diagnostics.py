@@ -0,0 +1,99 @@
+# Gufw - https://costales.github.io/projects/gufw/
+# Copyright (C) 2008-2025 Marcos Alvarez Costales https://costales.github.io
+#
+# Gufw is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Gufw is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gufw; if not, see http://www.gnu.org/licenses for more
+# information.
+
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+
+import gettext
+from gettext import gettext as _
+gettext.textdomain('gufw')
+
+
+class Diagnostics:
+    def __init__(self, gufw):
+        self.gufw = gufw
+
+        self.builder = Gtk.Builder()
+        self.builder.set_translation_domain('gufw')
+        self.builder.add_from_file('/usr/share/gufw/ui/diagnostics.ui')
+
+        self._set_objects_name()
+        self._set_initial_values()
+
+        self.win_diagnostics.set_transient_for(gufw.winMain)
+        self.builder.connect_signals(self)
+        self.win_diagnostics.show_all()
+
+    def _set_objects_name(self):
+        self.win_diagnostics = self.builder.get_object('diagnostics')
+        self.summary         = self.builder.get_object('summary')
+        self.tv_commands     = self.builder.get_object('commands')
+
+    def _set_initial_values(self):
+        self.commands_model = Gtk.ListStore(str,   # 0 command
+                                            int,   # 1 calls
+                                            float, # 2 total s
+                                            float, # 3 p50 ms
+                                            float, # 4 p95 ms
+                                            float, # 5 p99 ms
+                                            float, # 6 stderr %
+                                            str)   # 7 called from
+        self.tv_commands.set_model(self.commands_model)
+        render_txt = Gtk.CellRendererText()
+        columns = [(_("Command"), 0, ''), (_("Calls"), 1, '%d'), (_("Total (s)"), 2, '%.3f'), ("p50 (ms)", 3, '%.1f'),
+                   ("p95 (ms)", 4, '%.1f'), ("p99 (ms)", 5, '%.1f'), (_("Errors (%)"), 6, '%.1f'), (_("Called from"), 7, '')]
+        for (title, column, number_format) in columns:
+            tree_header = Gtk.TreeViewColumn(title, render_txt, text=column)
+            if number_format:
+                tree_header.set_cell_data_func(render_txt, self._format_number, (column, number_format))
+            tree_header.set_resizable(True)
+            tree_header.set_sort_column_id(column)
+            self.tv_commands.append_column(tree_header)
+        self._print_stats()
+
+    def _format_number(self, column, cell, model, row, data):
+        (num_column, number_format) = data
+        cell.set_property('text', number_format % model.get_value(row, num_column))
+
+    def _print_stats(self):
+        stats = self.gufw.frontend.get_command_stats()
+        self.commands_model.clear()
+        for (command, calls, total, p50, p95, p99, stderr, callers) in stats:
+            called_from = ', '.join(['%s (%d)' % (caller or '-', count) for (caller, count) in sorted(callers.items(), key=lambda item: -item[1])])
+            self.commands_model.append([command, calls, total, p50 * 1000, p95 * 1000, p99 * 1000, stderr * 100, called_from])
+
+        summary = [_("Commands run: %d in %.3f s") % (sum([stat[1] for stat in stats]), sum([stat[2] for stat in stats]))]
+        if self.gufw.startup_time is not None:
+            summary.append(_("Startup time: %.3f s") % self.gufw.startup_time)
+
+        # Listening Report: collections, skipped ticks (hidden or still collecting) & backoff
+        listening = self.gufw.listening.get_stats()
+        report = [_("Listening Report: %d collections in %.3f s (last %.1f ms)") % (listening['collections'], listening['collect_time'], listening['last_collect_time'] * 1000),
+                  _("Skipped: %d hidden, %d busy") % (listening['hidden_skips'], listening['busy_skips']),
+                  _("Errors: %d") % listening['errors'],
+                  _("Interval: %d s") % listening['interval']]
+        self.summary.set_text('    '.join(summary) + '\n' + '    '.join(report))
+
+    def on_refresh_btn_clicked(self, widget, data=None):
+        self._print_stats()
+
+    def on_close_btn_clicked(self, widget, data=None):
+        self.win_diagnostics.destroy()
+
+    def on_diagnostics_delete_event(self, widget, data=None):
+        self.win_diagnostics.destroy()
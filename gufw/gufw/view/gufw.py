@@ -22,7 +22,7 @@ from gi.repository import Gtk, Gdk
 Gdk.init([])
 from string import Template
 
-import os, re, sys, subprocess, platform
+import os, re, sys, subprocess, platform, time, ipaddress
 
 import gettext
 from gettext import gettext as _
@@ -32,7 +32,11 @@ from gufw.view.preferences import Preferences
 from gufw.view.add         import Add
 from gufw.view.update      import Update
 from gufw.view.listening   import ListeningReport
+from gufw.view.counters    import RuleCounters
 from gufw.view.about       import About
+from gufw.view.address_lists import AddressLists
+from gufw.view.diagnostics import Diagnostics
+from gufw.model.analyzer  import SHADOWED, REDUNDANT
 
 
 class Gufw:
@@ -69,8 +73,11 @@ class Gufw:
                    1: 'log',
                    2: 'log-all'}
 
-    def __init__(self, frontend):
+    def __init__(self, frontend, launch_time):
         self.frontend = frontend
+        self.launch_time = launch_time # bin/gufw, before pkexec
+        self.startup_time = None
+        self.profiles_filled = False
         
         self.builder = Gtk.Builder()
         self.builder.set_translation_domain('gufw')
@@ -102,6 +109,7 @@ class Gufw:
         self.show_add_btn    = self.builder.get_object('btnAddRule')
         self.detele_rule_btn = self.builder.get_object('btnDeleteRule')
         self.edit_rule_btn   = self.builder.get_object('btnEditRule')
+        self.clean_rules_btn = self.builder.get_object('btnCleanRules')
         
         self.report_box      = self.builder.get_object('boxReport')
         self.report          = self.builder.get_object('Report')
@@ -116,6 +124,7 @@ class Gufw:
         
         self.menu_file_import = self.builder.get_object('menu_import')
         self.menu_file_export = self.builder.get_object('menu_export')
+        self.menu_reorder     = self.builder.get_object('menu_reorder')
 
         self.statusbar = self.builder.get_object('statusmsg')
         self.progress  = self.builder.get_object('progress')
@@ -135,7 +144,11 @@ class Gufw:
                                           str,  # 11 routed
                                           str,  # 12 logging
                                           str,  # 13 color
-                                          int)  # 14 number (for deleting and updating)
+                                          int,  # 14 number (for deleting and updating)
+                                          str,  # 15 analysis
+                                          float, # 16 packets
+                                          float, # 17 bytes
+                                          float) # 18 packets/s
         self.tv_rules = self.rules
         self.tv_rules.set_model(self.rules_model)
         self.tv_rules.get_selection().set_mode(Gtk.SelectionMode.MULTIPLE)
@@ -146,7 +159,8 @@ class Gufw:
                                              str, # 2 address
                                              str, # 3 app
                                              str, # 4 color
-                                             int) # 5 number
+                                             int, # 5 number
+                                             str) # 6 partially allowed, denied...
         self.tv_report = self.report
         self.tv_report.set_model(self.listening_model)
         self.tv_report.get_selection().set_mode(Gtk.SelectionMode.SINGLE)
@@ -195,11 +209,11 @@ class Gufw:
         self.stack_vbox = self.builder.get_object('stack_vbox')
         self.stack_vbox.pack_start(vbox_1row, False, True, 0)
         self.stack_vbox.pack_end(stack, True, True, 0)
+        self.stack = stack
     
     def _set_initial_values(self):
-        for profile in self.frontend.get_all_profiles():
-            self.profile.append_text(profile)
-        self.profile.set_active(self.frontend.get_all_profiles().index(self.frontend.get_profile()))
+        if self.frontend.get_config_value('ShowProfiles') == 'yes': # Hidden: Filled on demand
+            self.fill_profiles()
         
         self.switchStatus.set_active(self.frontend.get_status())
         
@@ -212,6 +226,7 @@ class Gufw:
         self.show_add_btn.set_sensitive(self.frontend.get_status())
         self.detele_rule_btn.set_sensitive(self.frontend.get_status())
         self.edit_rule_btn.set_sensitive(self.frontend.get_status())
+        self.clean_rules_btn.set_sensitive(self.frontend.get_status())
         self.report_rule_btn.set_sensitive(self.frontend.get_status())
         
         render_txt = Gtk.CellRendererText()
@@ -235,6 +250,12 @@ class Gufw:
         tree_header.set_sort_column_id(1)
         tree_header.set_sizing(1)
         self.tv_rules.append_column(tree_header)
+        # Translators: Shadowed, redundant or conflicting rule
+        tree_header = Gtk.TreeViewColumn(_("Analysis"), render_txt, text=15, foreground=13)
+        tree_header.set_resizable(True)
+        tree_header.set_sort_column_id(15)
+        tree_header.set_sizing(1)
+        self.tv_rules.append_column(tree_header)
         
         # Listening Report
         # Translators: Number of  rule
@@ -259,23 +280,34 @@ class Gufw:
         tree_header.set_sizing(1)
         self.tv_report.append_column(tree_header)
         tree_header = Gtk.TreeViewColumn (_("Application"), render_txt, text=3, foreground=4)
+        tree_header.set_resizable(True)
         tree_header.set_sort_column_id(3)
         tree_header.set_sizing(1)
         self.tv_report.append_column(tree_header)
+        # Translators: A rule just for an interface or some addresses
+        tree_header = Gtk.TreeViewColumn (_("Note"), render_txt, text=6, foreground=4)
+        tree_header.set_sort_column_id(6)
+        tree_header.set_sizing(1)
+        self.tv_report.append_column(tree_header)
         
         self.listening = ListeningReport(self)
+        self.counters = RuleCounters(self)
         
         self.add_to_log(self.frontend.get_log(), self.GRAY, False)
         
         self._set_shield()
         
         self._restore_window_size(self.winMain)
+        self.first_draw = self.winMain.connect_after('draw', self._on_first_draw)
         self.winMain.show_all()
         
         if self.frontend.get_policy('routed') == 'disabled':
             self.routed_lbl.set_visible(False)
             self.box_routed.set_visible(False)
 
+        if not self.counters.enabled: # Needs the hits
+            self.menu_reorder.hide()
+        
         if self.frontend.get_config_value('ShowProfiles') != 'yes':
             self.profile.hide()
             self.profile_label.hide()
@@ -286,6 +318,19 @@ class Gufw:
         
         self.btn_report_play.hide()
 
+    def fill_profiles(self):
+        if self.profiles_filled:
+            return
+        self.profiles_filled = True
+        for profile in self.frontend.get_all_profiles():
+            self.profile.append_text(profile)
+        self.profile.set_active(self.frontend.get_all_profiles().index(self.frontend.get_profile()))
+    
+    def _on_first_draw(self, widget, cr):
+        self.winMain.disconnect(self.first_draw)
+        self.startup_time = time.time() - self.launch_time
+        return False
+    
     # Disable the context menu
     def context_menu_cb(webview, context_menu, event, hit_test_result, error):
         return True
@@ -313,7 +358,8 @@ class Gufw:
             self.show_dialog(self.winMain, _("Profile already exists"), _("Delete it before from the Preferences Window or rename the file (the profile will be the filename)"))
         else:
             self.frontend.import_profile(import_profile)
-            self.profile.append_text(profile)
+            if self.profiles_filled: # Else fill_profiles() adds it with the others
+                self.profile.append_text(profile)
             self.add_to_log(_("Profile imported: ") + import_profile)
             self.set_statusbar_msg(_("Profile imported, now you can choose it in the profiles"))
     
@@ -340,6 +386,7 @@ class Gufw:
     def _exit_gufw(self):
         self._save_window_size(self.winMain)
         self.listening.stopping()
+        self.counters.stopping()
         Gtk.main_quit()
     
     def _set_shield(self):
@@ -360,6 +407,57 @@ class Gufw:
             self.frontend.reset()
             self.add_to_log(_("Removed rules and reset firewall!"))
     
+    def on_menu_address_lists_activate(self, widget, data=None):
+        AddressLists(self)
+    
+    def on_menu_compact_activate(self, widget, data=None):
+        (target, before, after) = self.frontend.get_compacted_rules()
+        rules_before = self.frontend.get_rules()
+        if not [rule for rule in target if not isinstance(rule, int)]:
+            self.show_dialog(self.winMain, _("Compact Rules"), _("There are no single port rules to merge"))
+            return
+        
+        answer = self._show_question(self.winMain, _("Compact Rules"), _("Rules: %(before)s > %(after)s\niptables rules: %(ipt_before)s > %(ipt_after)s") % {'before': len(rules_before), 'after': len(target), 'ipt_before': before, 'ipt_after': after}, _("Do you want to continue?"))
+        if not answer:
+            return
+        
+        result = self.frontend.compact_rules()
+        rules_after = self.frontend.get_rules()
+        if len(rules_before) != len(rules_after):
+            for cmd in result:
+                self.add_to_log(cmd[0])
+            self.set_statusbar_msg(_("Rules compacted"))
+        else:
+            for cmd in result:
+                # Translators: Error running an ufw command
+                self.add_to_log(_("Error running: ") + cmd[0] + ' > ' + cmd[1].replace('\n', ' | '))
+            self.set_statusbar_msg(_("Error. Review Gufw Log"))
+        
+        self.print_rules(rules_after)
+    
+    def on_menu_reorder_activate(self, widget, data=None):
+        suggestion = self.frontend.get_reorder_suggestion(self.counters.counters)
+        if suggestion is None:
+            self.show_dialog(self.winMain, _("Reorder Rules by Hits"), _("This ufw version can't reorder the rules in one go"))
+            return
+        (order, saved, moved) = suggestion
+        if not moved or saved <= 0:
+            self.show_dialog(self.winMain, _("Reorder Rules by Hits"), _("The busiest rules are already as high as they can be"))
+            return
+        
+        answer = self._show_question(self.winMain, _("Reorder Rules by Hits"), _("%(moved)s rules will move, the verdicts won't change\nAbout %(saved)s rule comparisons less per second") % {'moved': moved, 'saved': int(saved)}, _("Do you want to continue?"))
+        if not answer:
+            return
+        
+        result = self.frontend.reorder_rules(order)
+        if result:
+            for cmd in result:
+                self.add_to_log(cmd[0])
+            self.set_statusbar_msg(_("Rules reordered"))
+        else: # Rules changed meanwhile
+            self.set_statusbar_msg(_("Rules changed. Try again"))
+        self.print_rules(self.frontend.get_rules())
+    
     def on_btnLogRemove_clicked(self, widget, data=None):
         self.frontend.refresh_log()
         self.log_txt.set_text('')
@@ -371,6 +469,9 @@ class Gufw:
         self.clipboard.set_text(self.frontend.get_log(), -1)
         self.set_statusbar_msg(_("Text copied to clipboard"))
     
+    def on_menu_diagnostics_activate(self, widget, data=None):
+        Diagnostics(self)
+    
     def on_menu_about_activate(self, widget, data=None):
         aboutwin = About(self)
     
@@ -463,6 +564,7 @@ class Gufw:
         self.show_add_btn.set_sensitive(self.frontend.get_status())
         self.detele_rule_btn.set_sensitive(self.frontend.get_status())
         self.edit_rule_btn.set_sensitive(self.frontend.get_status())
+        self.clean_rules_btn.set_sensitive(self.frontend.get_status())
         self.report_rule_btn.set_sensitive(self.frontend.get_status())
         self._set_shield()
         if self.frontend.get_status() != self.switchStatus.get_active():
@@ -504,6 +606,31 @@ class Gufw:
         else:
             self.show_dialog(self.winMain, _("No rule selected"), _("You have to select a rule"))
     
+    def on_btnCleanRules_clicked(self, widget, data=None):
+        redundant = [num for (num, (kind, other)) in self.frontend.analyze_rules().items() if kind == REDUNDANT]
+        if not redundant:
+            self.show_dialog(self.winMain, _("No redundant rules"), _("Every rule is reachable or has a different action than the rule taking its traffic"))
+            return
+        
+        answer = self._show_question(self.winMain, _("Remove redundant rules"), _("%s rules can't match and an earlier rule with the same action takes their traffic") % len(redundant), _("Do you want to continue?"))
+        if not answer:
+            return
+        
+        rules_before = self.frontend.get_rules()
+        result = self.frontend.remove_redundant_rules()
+        rules_after = self.frontend.get_rules()
+        if len(rules_before) != len(rules_after):
+            for cmd in result:
+                self.add_to_log(cmd[0])
+            self.set_statusbar_msg(_("Rule(s) deleted"))
+        else:
+            for cmd in result:
+                # Translators: Error running an ufw command
+                self.add_to_log(_("Error running: ") + cmd[0] + ' > ' + cmd[1].replace('\n', ' | '))
+            self.set_statusbar_msg(_("Error. Review Gufw Log"))
+        
+        self.print_rules(rules_after)
+    
     def _get_total_rows(self, model):
         i = 0
         while True:
@@ -544,6 +671,8 @@ class Gufw:
         updatewin = Update(self, ufw_row, description, cmd, policy, direction, proto, from_ip, from_port, to_ip, to_port, iface, routed, logging)
 
     def on_profile_changed(self, widget, data=None):
+        if self.profile.get_active_text() == self.frontend.get_profile(): # Filling the profiles
+            return
         operation = self.frontend.set_profile(self.profile.get_active_text())
         self.add_to_log(_("Changing profile: ") + self.profile.get_active_text())
         
@@ -611,11 +740,12 @@ class Gufw:
         if not self.frontend.get_status():
             return
         
+        analysis = self.frontend.analyze_rules()
         row = 1
         for rule in (rules):
             iter_row = self.rules_model.insert(row)
             # Translators: ufw string
-            translated_rule = rule['ufw_rule'].replace(" ALLOW ",  _(" ALLOW "))
+            translated_rule = rule.ufw_rule.replace(" ALLOW ",  _(" ALLOW "))
             # Translators: ufw string
             translated_rule = translated_rule.replace(" DENY ",    _(" DENY "))
             # Translators: ufw string
@@ -640,32 +770,41 @@ class Gufw:
             translated_rule = translated_rule.replace(" on ",      _(" on "))
             
             self.rules_model.set_value(iter_row, 0,  translated_rule)     # ufw rule
-            self.rules_model.set_value(iter_row, 1,  rule['description']) # description
-            self.rules_model.set_value(iter_row, 2,  rule['command'])     # command
-            self.rules_model.set_value(iter_row, 3,  rule['policy'])      # policy
-            self.rules_model.set_value(iter_row, 4,  rule['direction'])   # direction
-            self.rules_model.set_value(iter_row, 5,  rule['protocol'])    # proto
-            self.rules_model.set_value(iter_row, 6,  rule['from_ip'])     # from_ip
-            self.rules_model.set_value(iter_row, 7,  rule['from_port'])   # from_port
-            self.rules_model.set_value(iter_row, 8,  rule['to_ip'])       # to_ip
-            self.rules_model.set_value(iter_row, 9,  rule['to_port'])     # to_port
-            self.rules_model.set_value(iter_row, 10, rule['iface'])       # iface
-            self.rules_model.set_value(iter_row, 11, rule['routed'])      # routed
-            self.rules_model.set_value(iter_row, 12, rule['logging'])     # logging
+            self.rules_model.set_value(iter_row, 1,  rule.description)    # description
+            self.rules_model.set_value(iter_row, 2,  rule.command)        # command
+            self.rules_model.set_value(iter_row, 3,  rule.policy)         # policy
+            self.rules_model.set_value(iter_row, 4,  rule.direction)      # direction
+            self.rules_model.set_value(iter_row, 5,  rule.protocol)       # proto
+            self.rules_model.set_value(iter_row, 6,  rule.from_ip)        # from_ip
+            self.rules_model.set_value(iter_row, 7,  rule.from_port)      # from_port
+            self.rules_model.set_value(iter_row, 8,  rule.to_ip)          # to_ip
+            self.rules_model.set_value(iter_row, 9,  rule.to_port)        # to_port
+            self.rules_model.set_value(iter_row, 10, rule.iface)          # iface
+            self.rules_model.set_value(iter_row, 11, rule.routed)         # routed
+            self.rules_model.set_value(iter_row, 12, rule.logging)        # logging
             self.rules_model.set_value(iter_row, 14, row)                 # number
+            self.rules_model.set_value(iter_row, 15, self._analysis_text(analysis.get(row))) # analysis
             
-            if 'ALLOW' in rule['ufw_rule']:
-                self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR['allow'])  # color
-            elif 'DENY' in rule['ufw_rule']:
-                self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR['deny'])   # color
-            elif 'REJECT' in rule['ufw_rule']:
-                self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR['reject']) # color
-            elif 'LIMIT' in rule['ufw_rule']:
-                self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR['limit'])  # color
-            else:
-                self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR['others']) # color
+            self.rules_model.set_value(iter_row, 13, self.POLICY2COLOR.get(rule.action, self.POLICY2COLOR['others'])) # color
             
             row += 1
+        
+        # Counters by number: the last sample until the next one
+        self.counters.show()
+        self.counters.refresh()
+    
+    def _analysis_text(self, result):
+        if result is None:
+            return ''
+        (kind, other) = result
+        if kind == SHADOWED:
+            # Translators: Another rule before takes all its traffic
+            return _("Shadowed by %s") % other
+        if kind == REDUNDANT:
+            # Translators: Another rule before takes all its traffic with the same action
+            return _("Redundant with %s") % other
+        # Translators: Another rule before takes part of its traffic with another action
+        return _("Conflicts with %s") % other
     
     def _file_dialog(self, type_dialog, title):
         if type_dialog == 'open':
@@ -721,6 +860,40 @@ class Gufw:
         self.frontend.set_config_value('WindowWidth',  str(width))
         self.frontend.set_config_value('WindowHeight', str(height))
     
+    def simulate_rule(self, win, policy, direction, iface, routed, proto, from_ip, from_port, to_ip, to_port, ignore=()):
+        """Before applying a rule: What the current rules do with its traffic.
+           Returns a note for the statusbar ('' if none) or None if the user cancels"""
+        directions = [direction]
+        if routed:
+            directions = ['routed']
+        elif direction == 'both':
+            directions = ['in', 'out']
+        
+        # Routed: iface is the out interface of an 'out' rule
+        (sim_iface, sim_routed) = (iface, routed)
+        if routed and direction == 'out':
+            (sim_iface, sim_routed) = (routed, iface)
+        
+        verdicts = []
+        for sim_direction in directions:
+            (rule, verdict) = self.frontend.simulate(sim_direction, sim_iface, proto, self._sample_address(from_ip), from_port, self._sample_address(to_ip), to_port, ignore, sim_routed)
+            if rule is not None: # Shadowed
+                if not self._show_question(win, _("Rule shadowed"), _("This traffic already matches the rule: ") + rule.ufw_rule + ' (' + verdict + ')', _("Do you want to continue?")):
+                    return None
+                return ''
+            verdicts.append(verdict)
+        
+        if verdicts:
+            return ' (' + _("before, this traffic got the default policy: ") + ', '.join(verdicts) + ')'
+        return ''
+    
+    def _sample_address(self, address):
+        # A packet of the rule: The network address
+        try:
+            return str(ipaddress.ip_network(address, strict=False).network_address)
+        except ValueError:
+            return ''
+    
     def validate_rule(self, win, from_ip, from_port, to_ip, to_port, insert='', routed=''):
         # At least 1 Port/IP
         if not from_ip and not from_port and not to_ip and not to_port and routed == "Not Forward":
@@ -16,12 +16,18 @@
 # information.
 
 import gi
-import re
+import re, time, threading, traceback
 gi.require_version('Gtk', '3.0')
-from gi.repository import GLib, Gtk
+gi.require_version('Gdk', '3.0')
+from gi.repository import GLib, Gtk, Gdk
 
+import gettext
+from gettext import gettext as _
+gettext.textdomain('gufw')
 
-REFRESH_TIME = 3 # Default interval refresh
+
+REFRESH_TIME = 3  # Default interval refresh
+MAX_BACKOFF  = 16 # Stable sockets: up to RefreshInterval x 16
 
 
 class ListeningReport():
@@ -29,87 +35,182 @@ class ListeningReport():
     def __init__(self, gufw):
         self.gufw = gufw
         self.previous_report = []
+        self.rows = {} # (protocol, port, address, app) > row in listening_model
         self.running_listening = True
         self.paused_listening = False
-        
-        self._show_report()
+        self.iconified = False
+        self.collecting = False
+        self.timer = None
+        self.stats = {'collections': 0, 'collect_time': 0.0, 'last_collect_time': 0.0,
+                      'hidden_skips': 0, 'busy_skips': 0, 'errors': 0, 'interval': 0}
         
         if self.gufw.frontend.get_config_value('RefreshInterval'):
-            time = int(self.gufw.frontend.get_config_value('RefreshInterval'))
+            self.refresh_time = int(self.gufw.frontend.get_config_value('RefreshInterval'))
         else:
-            time = REFRESH_TIME
-        GLib.timeout_add((time * 1000), self._show_report)
+            self.refresh_time = REFRESH_TIME
+        self.interval = self.refresh_time
+        
+        # Refresh just while the report is shown
+        self.visible = threading.Event()
+        self.gufw.stack.connect('notify::visible-child-name', self._on_visibility_changed)
+        self.gufw.winMain.connect('window-state-event', self._on_window_state)
+        self.gufw.winMain.connect('focus-in-event', self._on_visibility_changed)
+        self._update_visible()
         
+        if self.gufw.frontend.get_listening_monitor(): # On every change (and interval for the policies)
+            threading.Thread(target=self._monitor_report, daemon=True).start()
+        else:
+            self._show_report()
+    
+    def get_stats(self):
+        """What the report costs: collections, collect time (s), skipped ticks, failed collections, current interval (s)"""
+        stats = dict(self.stats)
+        stats['interval'] = self.interval
+        return stats
+    
+    def _update_visible(self):
+        if self.running_listening and not self.paused_listening and not self.iconified and self.gufw.stack.get_visible_child_name() == 'report':
+            self.visible.set()
+        else:
+            self.visible.clear()
+    
+    def _on_visibility_changed(self, *args):
+        was_visible = self.visible.is_set()
+        self._update_visible()
+        if self.visible.is_set() and (not was_visible or self.interval != self.refresh_time):
+            self._refresh_now()
+        return False
+    
+    def _on_window_state(self, widget, event):
+        self.iconified = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        return self._on_visibility_changed()
+    
+    def _refresh_now(self):
+        # Back to RefreshInterval
+        self.interval = self.refresh_time
+        if not self.gufw.frontend.get_listening_monitor():
+            self._show_report()
+    
+    def _schedule(self):
+        if self.timer:
+            GLib.source_remove(self.timer)
+        self.timer = GLib.timeout_add(int(self.interval * 1000), self._on_timer)
+    
+    def _on_timer(self):
+        self.timer = None
+        self._show_report()
+        return False
+    
     def _show_report(self):
         if not self.running_listening:
-            return False
-        
-        report = self.gufw.frontend.get_listening_report()
-        self._view_report(report, self.previous_report)
-        self.previous_report = report
+            return
+        if not self.visible.is_set(): # Hidden: until it's shown again
+            self.stats['hidden_skips'] += 1
+            return
+        if self.collecting: # Slow collection: skip this tick, don't queue it
+            self.stats['busy_skips'] += 1
+            return
         
-        while Gtk.events_pending(): # Not freeze main win
-            Gtk.main_iteration()
+        self.collecting = True
+        threading.Thread(target=self._collect_report, daemon=True).start()
+    
+    def _collect_report(self):
+        # Worker thread: GTK only from the main loop
+        report = None
+        start = time.monotonic()
+        try:
+            report = self.gufw.frontend.get_listening_report()
+        except Exception: # Logged. The next tick tries again
+            traceback.print_exc()
+        finally:
+            GLib.idle_add(self._collected_report, report, time.monotonic() - start)
+    
+    def _monitor_report(self):
+        # Worker thread. Changes are watched by the model, with its own backoff
+        while self.running_listening:
+            if not self.visible.is_set():
+                self.stats['hidden_skips'] += 1
+                self.visible.wait()
+                continue
+            start = time.monotonic()
+            try:
+                report = self.gufw.frontend.get_listening_report()
+                GLib.idle_add(self._collected_report, report, time.monotonic() - start)
+                self.gufw.frontend.wait_listening_change(self.refresh_time)
+            except Exception: # Logged. Tried again after RefreshInterval
+                traceback.print_exc()
+                GLib.idle_add(self._collected_report, None, time.monotonic() - start)
+                time.sleep(self.refresh_time)
+    
+    def _collected_report(self, report, collect_time):
+        self.collecting = False
+        self.stats['collections'] += 1
+        self.stats['collect_time'] += collect_time
+        self.stats['last_collect_time'] = collect_time
+        if not self.running_listening:
+            return False
         
-        return True
+        if report is None: # Failed: the same interval again
+            self.stats['errors'] += 1
+        else:
+            # Stable: exponential backoff. Changed: back to RefreshInterval
+            if report == self.previous_report:
+                self.interval = min(self.interval * 2, self.refresh_time * MAX_BACKOFF)
+            else:
+                self.interval = self.refresh_time
+            
+            self._view_report(report, self.previous_report)
+            self.previous_report = report
+        if not self.gufw.frontend.get_listening_monitor():
+            self._schedule()
+        return False
     
     def stopping(self):
         self.running_listening = False
+        self.visible.set() # Ends the monitor thread
     
     def set_pause(self, value):
         self.paused_listening = value
+        self._on_visibility_changed()
     
     def _view_report(self, report, previous_report):
         if self.paused_listening:
             return
-        # Selected?
-        protocol = port = address = app = ''
-        (model, rows) = self.gufw.tv_report.get_selection().get_selected_rows()
-        if len(rows) == 1:
-            iter_row = self.gufw.listening_model.get_iter(rows[0],)
-            protocol = self.gufw.listening_model.get_value(iter_row, 0)
-            port     = str(self.gufw.listening_model.get_value(iter_row, 1))
-            address  = self.gufw.listening_model.get_value(iter_row, 2)
-            app      = self.gufw.listening_model.get_value(iter_row, 3)
+        # Diff against the rows in the view (previous_report goes on while paused)
+        # The rows not removed keep their selection and scroll position
+        model = self.gufw.listening_model
+        current = set([listener.get_key() for listener in report])
+        for key in [key for key in self.rows if key not in current]: # Closed
+            model.remove(self.rows.pop(key))
         
+        status = self.gufw.frontend.get_status()
         row = 0
-        self.gufw.listening_model.clear()
-        
-        for line in report:
-            line_split = line.split('%')
+        for listener in report:
             row += 1
-            iter_row = self.gufw.listening_model.insert(row)
-            self.gufw.listening_model.set_value(iter_row, 0, line_split[0].strip())      # protocol
-            self.gufw.listening_model.set_value(iter_row, 1, int(line_split[1].strip())) # port
-            self.gufw.listening_model.set_value(iter_row, 2, line_split[2].strip())      # address
-            self.gufw.listening_model.set_value(iter_row, 3, line_split[3].strip())      # app
-            self.gufw.listening_model.set_value(iter_row, 5, row)                        # number
+            color = None
+            if status and listener.policy:
+                color = self.gufw.POLICY2COLOR[listener.policy]
+            note = ''
+            if status and listener.partial:
+                note = self._partial_text(listener.partial)
             
-            if self.gufw.frontend.get_status():
-                if line_split[4] == 'allow':
-                    self.gufw.listening_model.set_value(iter_row, 4, self.gufw.RED)
-                elif line_split[4] == 'deny':
-                    self.gufw.listening_model.set_value(iter_row, 4, self.gufw.GREEN)
-                elif line_split[4] == 'reject':
-                    self.gufw.listening_model.set_value(iter_row, 4, self.gufw.BLUE)
-                elif line_split[4] == 'limit':
-                    self.gufw.listening_model.set_value(iter_row, 4, self.gufw.ORANGE)
-        
-        # Previously selected? > Get current row because treeview could be sorted
-        if protocol and port:
-            select_this_row = -1
-            i = 0
-            while True:
-                try:
-                    iter_row = self.gufw.listening_model.get_iter(i,)
-                    if (protocol == self.gufw.listening_model.get_value(iter_row, 0) and
-                        port     == str(self.gufw.listening_model.get_value(iter_row, 1)) and
-                        address  == self.gufw.listening_model.get_value(iter_row, 2) and
-                        app      == self.gufw.listening_model.get_value(iter_row, 3)):
-                        select_this_row = i
-                except Exception:
-                    break
-                i += 1
+            key = listener.get_key()
+            if key not in self.rows: # New
+                self.rows[key] = model.insert_with_valuesv(row - 1, [0, 1, 2, 3, 4, 5, 6], [listener.protocol, listener.port, listener.address, listener.app, color, row, note])
+                continue
             
-            if select_this_row != -1:
-                self.gufw.tv_report.set_cursor(select_this_row)
+            iter_row = self.rows[key]
+            if model.get_value(iter_row, 4) != color:
+                model.set_value(iter_row, 4, color) # color
+            if model.get_value(iter_row, 5) != row:
+                model.set_value(iter_row, 5, row)   # number
+            if model.get_value(iter_row, 6) != note:
+                model.set_value(iter_row, 6, note)  # partially
+    
+    def _partial_text(self, action):
+        # A rule before the matching one decides for an interface or some addresses
+        texts = {'allow':  _("Partially allowed"),
+                 'deny':   _("Partially denied"),
+                 'reject': _("Partially rejected"),
+                 'limit':  _("Partially limited")}
+        return texts.get(action, '')
@@ -38,6 +38,7 @@ UFW_LEVEL2NUM = {'off'    : 0,
 class Preferences:
     def __init__(self, gufw):
         self.gufw = gufw
+        self.gufw.fill_profiles() # Could be hidden until now
         
         self.builder = Gtk.Builder()
         self.builder.set_translation_domain('gufw')
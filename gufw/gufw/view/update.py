@@ -251,8 +251,14 @@ class Update:
             self.warning.set_text(_("No changes were made!"))
             return
         
-        # Delete the same rules
+        # Simulate against the other rules (the edited one goes to the end)
         same_rules_rows = self._get_same_rules(self.rule_cmd)
+        simulation = self.gufw.simulate_rule(self.win_update, new_policy, new_direction, new_iface, new_routed, new_proto, new_from_ip, new_from_port, new_to_ip, new_to_port, same_rules_rows)
+        if simulation is None:
+            self.gufw.set_statusbar_msg(_("Operation cancelled"))
+            return
+        
+        # Delete the same rules
         for same_row in same_rules_rows:
             cmd = self.gufw.frontend.delete_rule(same_row)
             self.gufw.add_to_log(_("Editing rule (Removing): ") + new_description + ' | ' + cmd[0] + ' > ' + cmd[1].replace('\n', ' | '))
@@ -262,7 +268,7 @@ class Update:
         cmd = self.gufw.frontend.add_rule(new_description, insert_row, new_policy, new_direction, new_iface, new_routed, new_logging, new_proto, new_from_ip, new_from_port, new_to_ip, new_to_port)
 
         self.gufw.add_to_log(_("Editing rule (Adding): ") + new_description + ' | ' + cmd[1] + ' > ' + cmd[2].replace('\n', ' | '), self.gufw.POLICY2COLOR[new_policy])
-        self.gufw.set_statusbar_msg(_("Updated rule ") + str(self.ufw_row))
+        self.gufw.set_statusbar_msg(_("Updated rule ") + str(self.ufw_row) + simulation)
         
         self.gufw.print_rules(self.gufw.frontend.get_rules())
         self.win_update.destroy()